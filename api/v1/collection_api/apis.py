@@ -2,7 +2,10 @@ from apps.collection.models import Collection, LinkCollection
 from apps.collection.selectors import (
     collection_get,
     collection_list,
+    collection_list_state,
+    collection_updated_at,
     link_collection_list,
+    link_collection_list_state,
 )
 from apps.collection.services import (
     collection_create,
@@ -17,7 +20,19 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from rest_framework import views
 from rest_framework.permissions import IsAuthenticated
-from core.utils import LimitOffsetPagination, get_paginated_response, inline_serializer
+from rest_framework.renderers import BrowsableAPIRenderer
+from core.cache import cache_user_response
+from core.renderers import ORJSONRenderer
+from core.utils import (
+    KeysetPagination,
+    LimitOffsetPagination,
+    get_if_match,
+    get_paginated_response,
+    inline_serializer,
+    list_condition,
+    make_etag,
+    object_condition,
+)
 
 
 class CollectionCreateApi(views.APIView):
@@ -63,7 +78,6 @@ class CollectionGetApi(views.APIView):
             fields={
                 "id": serializers.IntegerField(),
                 "email": serializers.EmailField(),
-                "password": serializers.CharField(),
             }
         )
 
@@ -71,6 +85,12 @@ class CollectionGetApi(views.APIView):
             model = Collection
             fields = "__all__"
 
+    @object_condition(
+        lambda request, collection_id: collection_updated_at(
+            user_id=request.user.pk, collection_id=collection_id
+        )
+    )
+    @cache_user_response
     @extend_schema(
         request=CollectionGetSerializer,
         responses={
@@ -93,6 +113,10 @@ class CollectionListApi(views.APIView):
     API endpoint for retrieving a list of collections. Requires authentication.
     Body Parameters:
         None
+    Query Parameters:
+        limit (int), offset (int): Offset pagination.
+        count (bool): Pass false to skip counting the rows; "count" is then null.
+        cursor (str): Keyset pagination; send it empty for the first page, then follow "next".
     Returns:
         The HTTP response containing the list of collections.
     Methods:
@@ -100,6 +124,18 @@ class CollectionListApi(views.APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    # Projection used instead of CollectionListSerializer when FAST_LIST_RESPONSES is enabled.
+    list_values = (
+        "id",
+        "name",
+        "description",
+        "created_at",
+        "updated_at",
+        "user__id",
+        "user__email",
+    )
 
     class Pagination(LimitOffsetPagination):
         default_limit = 10
@@ -109,7 +145,6 @@ class CollectionListApi(views.APIView):
             fields={
                 "id": serializers.IntegerField(),
                 "email": serializers.EmailField(),
-                "password": serializers.CharField(),
             }
         )
 
@@ -117,6 +152,8 @@ class CollectionListApi(views.APIView):
             model = Collection
             fields = "__all__"
 
+    @list_condition(lambda request: collection_list_state(user_id=request.user.pk))
+    @cache_user_response
     @extend_schema(
         request=CollectionListSerializer,
         responses={
@@ -127,13 +164,12 @@ class CollectionListApi(views.APIView):
         description="Retrieve a paginated list of collections",
     )
     def get(self, request):
-        data = self.CollectionListSerializer(
-            collection_list(user_id=request.user.pk), many=True
-        ).data
         return get_paginated_response(
             pagination_class=self.Pagination,
+            keyset_pagination_class=KeysetPagination,
             serializer_class=self.CollectionListSerializer,
-            queryset=data,
+            queryset=collection_list(user_id=request.user.pk),
+            values=self.list_values,
             request=request,
             view=self,
         )
@@ -176,10 +212,14 @@ class CollectionUpdateApi(views.APIView):
     Body Parameters:
         name (str): The name of the collection.
         description (str): The description of the collection.
+    Headers:
+        If-Match (str): Optional ETag of the collection as last read; the update fails
+            with 412 if the collection changed since.
     Returns:
-        The HTTP response indicating the success of the collection update.
+        The HTTP response indicating the success of the collection update, with the new ETag.
     Methods:
         PUT: Update the specified collection.
+        PATCH: Update some fields of the specified collection.
     """
 
     permission_classes = [IsAuthenticated]
@@ -195,19 +235,40 @@ class CollectionUpdateApi(views.APIView):
             200: None,
             401: OpenApiResponse(description="User is not authenticated"),
             404: OpenApiResponse(description="Collection is not found"),
+            412: OpenApiResponse(description="Collection was modified since it was read"),
         },
         tags=["collections"],
         description="Update a collection",
     )
     def put(self, request, collection_id: int):
-        serializer = self.CollectionUpdateSerializer(data=request.data)
+        return self.update(request, collection_id, partial=False)
+
+    @extend_schema(
+        request=CollectionUpdateSerializer(partial=True),
+        responses={
+            200: None,
+            401: OpenApiResponse(description="User is not authenticated"),
+            404: OpenApiResponse(description="Collection is not found"),
+            412: OpenApiResponse(description="Collection was modified since it was read"),
+        },
+        tags=["collections"],
+        description="Update some fields of a collection",
+    )
+    def patch(self, request, collection_id: int):
+        return self.update(request, collection_id, partial=True)
+
+    def update(self, request, collection_id: int, partial: bool):
+        serializer = self.CollectionUpdateSerializer(data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        collection_update(
+        collection = collection_update(
             user_id=request.user.id,
             collection_id=collection_id,
+            expected_updated_at=get_if_match(request),
             **serializer.validated_data,
         )
-        return Response(status=status.HTTP_200_OK)
+        return Response(
+            status=status.HTTP_200_OK, headers={"ETag": make_etag(collection.updated_at)}
+        )
 
 
 class LinkCollectionCreateApi(views.APIView):
@@ -250,6 +311,10 @@ class LinkCollectionListApi(views.APIView):
     API endpoint for retrieving a list of link collections. Requires authentication.
     Body Parameters:
         None
+    Query Parameters:
+        limit (int), offset (int): Offset pagination.
+        count (bool): Pass false to skip counting the rows; "count" is then null.
+        cursor (str): Keyset pagination; send it empty for the first page, then follow "next".
     Returns:
         The HTTP response containing the list of link collections.
     Methods:
@@ -257,10 +322,26 @@ class LinkCollectionListApi(views.APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    # Projection used instead of LinkCollectionListSerializer when FAST_LIST_RESPONSES is enabled.
+    list_values = (
+        "id",
+        "collection__name",
+        "collection__description",
+        "link__link_url",
+        "link__title",
+        "link__description",
+        "link__image",
+        "link__link_type",
+    )
 
     class Pagination(LimitOffsetPagination):
         default_limit = 10
 
+    class CursorPagination(KeysetPagination):
+        ordering = ("-id",)
+
     class LinkCollectionListSerializer(serializers.ModelSerializer):
         collection = inline_serializer(
             fields={
@@ -282,6 +363,8 @@ class LinkCollectionListApi(views.APIView):
             model = LinkCollection
             fields = "__all__"
 
+    @list_condition(lambda request: link_collection_list_state(user_id=request.user.pk))
+    @cache_user_response
     @extend_schema(
         request=LinkCollectionListSerializer,
         responses={
@@ -292,13 +375,12 @@ class LinkCollectionListApi(views.APIView):
         description="Retrieve a paginated list of link collections",
     )
     def get(self, request):
-        data = self.LinkCollectionListSerializer(
-            link_collection_list(user_id=request.user.id), many=True
-        ).data
         return get_paginated_response(
             pagination_class=self.Pagination,
+            keyset_pagination_class=self.CursorPagination,
             serializer_class=self.LinkCollectionListSerializer,
-            queryset=data,
+            queryset=link_collection_list(user_id=request.user.id),
+            values=self.list_values,
             request=request,
             view=self,
         )
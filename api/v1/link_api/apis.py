@@ -3,13 +3,39 @@ from rest_framework.response import Response
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import views
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 
-from apps.links.services import link_create, link_delete, link_update
-from apps.links.models import Link
-from apps.links.selectors import link_get, link_list
-from core.utils import LimitOffsetPagination, get_paginated_response, inline_serializer
+from apps.links.exporters import EXPORT_FORMATS, export_links
+from apps.links.importers import parse_import_file
+from apps.links.services import link_bulk_create, link_create, link_delete, link_update
+from apps.links.models import Link, LinkStats
+from apps.links.selectors import (
+    link_count,
+    link_get,
+    link_list,
+    link_list_state,
+    link_search,
+    link_search_state,
+    link_stats_get,
+    link_stats_leaderboard,
+    link_updated_at,
+)
+from core.cache import cache_user_response
+from core.renderers import ORJSONRenderer
+from core.utils import (
+    KeysetPagination,
+    LimitOffsetPagination,
+    get_if_match,
+    get_paginated_response,
+    inline_serializer,
+    list_condition,
+    make_etag,
+    object_condition,
+)
 
 
 class LinkCreateApi(views.APIView):
@@ -18,7 +44,8 @@ class LinkCreateApi(views.APIView):
     Body Parameters:
         link (str): The URL of the link to be created.
     Returns:
-        The HTTP response indicating the success of the link creation.
+        The ID and enrichment status of the new link. The response is 202 while
+        the Open Graph data is still being fetched in the background.
     Methods:
         POST: Create a new link.
     """
@@ -28,10 +55,16 @@ class LinkCreateApi(views.APIView):
     class LinkCreateSerializer(serializers.Serializer):
         link = serializers.URLField()
 
+    class LinkCreateOutputSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = Link
+            fields = ["id", "enrichment_status"]
+
     @extend_schema(
         request=LinkCreateSerializer,
         responses={
-            201: None,
+            201: LinkCreateOutputSerializer,
+            202: LinkCreateOutputSerializer,
             401: OpenApiResponse(description="User is not authenticated"),
         },
         tags=["links"],
@@ -40,8 +73,84 @@ class LinkCreateApi(views.APIView):
     def post(self, request):
         serializer = self.LinkCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        link_create(user=request.user, **serializer.validated_data)
-        return Response(status=status.HTTP_201_CREATED)
+        link = link_create(user=request.user, **serializer.validated_data)
+        data = self.LinkCreateOutputSerializer(link).data
+
+        if link.enrichment_status == Link.EnrichmentStatus.PENDING:
+            return Response(data, status=status.HTTP_202_ACCEPTED)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class LinkBulkCreateApi(views.APIView):
+    """
+    API endpoint for importing many links at once. Requires authentication.
+    Body Parameters:
+        links (list[str]): The URLs to save.
+        file (file): Alternatively, a JSON list of URLs or a Netscape bookmarks HTML file.
+    Returns:
+        A per-URL report with the status of every link.
+    Methods:
+        POST: Import links.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    class LinkBulkCreateSerializer(serializers.Serializer):
+        links = serializers.ListField(
+            child=serializers.CharField(),
+            required=False,
+            max_length=settings.LINK_BULK_IMPORT_MAX_LINKS,
+        )
+        file = serializers.FileField(required=False)
+
+        def validate_file(self, value):
+            if value.size > settings.LINK_BULK_IMPORT_MAX_FILE_SIZE:
+                raise serializers.ValidationError(
+                    f"The file must be at most {settings.LINK_BULK_IMPORT_MAX_FILE_SIZE} bytes"
+                )
+            return value
+
+        def validate(self, attrs):
+            if not attrs.get("links") and not attrs.get("file"):
+                raise serializers.ValidationError("Provide either links or file")
+            return attrs
+
+    class LinkBulkCreateOutputSerializer(serializers.Serializer):
+        url = serializers.CharField()
+        status = serializers.ChoiceField(
+            choices=["created", "exists", "duplicate", "invalid"]
+        )
+        id = serializers.IntegerField(required=False)
+        enrichment_status = serializers.CharField(required=False)
+
+    @extend_schema(
+        request=LinkBulkCreateSerializer,
+        responses={
+            201: LinkBulkCreateOutputSerializer(many=True),
+            202: LinkBulkCreateOutputSerializer(many=True),
+            400: OpenApiResponse(description="Bad request. Invalid links or file"),
+            401: OpenApiResponse(description="User is not authenticated"),
+        },
+        tags=["links"],
+        description="Import many links from a list of URLs or a bookmarks file",
+    )
+    def post(self, request):
+        serializer = self.LinkBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        links = serializer.validated_data.get("links") or []
+        if "file" in serializer.validated_data:
+            links = links + parse_import_file(serializer.validated_data["file"].read())
+        if len(links) > settings.LINK_BULK_IMPORT_MAX_LINKS:
+            raise serializers.ValidationError(
+                {"links": f"At most {settings.LINK_BULK_IMPORT_MAX_LINKS} links can be imported at once"}
+            )
+
+        report = link_bulk_create(user=request.user, links=links)
+
+        if settings.LINK_ENRICHMENT_ASYNC:
+            return Response(report, status=status.HTTP_202_ACCEPTED)
+        return Response(report, status=status.HTTP_201_CREATED)
 
 
 class LinkListApi(views.APIView):
@@ -49,6 +158,10 @@ class LinkListApi(views.APIView):
     API endpoint for retrieving a list of links. Requires authentication.
     Body Parameters:
         None
+    Query Parameters:
+        limit (int), offset (int): Offset pagination.
+        count (bool): Pass false to skip counting the rows; "count" is then null.
+        cursor (str): Keyset pagination; send it empty for the first page, then follow "next".
     Returns:
         The HTTP response containing the list of links.
     Methods:
@@ -56,23 +169,43 @@ class LinkListApi(views.APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    # Projection used instead of LinkListSerializer when FAST_LIST_RESPONSES is enabled.
+    list_values = (
+        "id",
+        "link_url",
+        "title",
+        "description",
+        "image",
+        "link_type",
+        "enrichment_status",
+        "created_at",
+        "updated_at",
+        "user__id",
+        "user__email",
+    )
 
     class Pagination(LimitOffsetPagination):
         default_limit = 10
 
+        def get_counter(self, queryset):
+            return link_count(user_id=self.request.user.pk)
+
     class LinkListSerializer(serializers.ModelSerializer):
         user = inline_serializer(
             fields={
                 "id": serializers.IntegerField(),
                 "email": serializers.EmailField(),
-                "password": serializers.CharField(),
             }
         )
 
         class Meta:
             model = Link
-            fields = "__all__"
+            exclude = ["search_vector"]
 
+    @list_condition(lambda request: link_list_state(user_id=request.user.pk))
+    @cache_user_response
     @extend_schema(
         request=LinkListSerializer,
         responses={
@@ -83,18 +216,210 @@ class LinkListApi(views.APIView):
         description="Retrieve a paginated list of links",
     )
     def get(self, request):
-        data = self.LinkListOutputSerializer(
-            link_list(user_id=request.user.pk), many=True
-        ).data
         return get_paginated_response(
             pagination_class=self.Pagination,
-            serializer_class=self.LinkListOutputSerializer,
-            queryset=data,
+            keyset_pagination_class=KeysetPagination,
+            serializer_class=self.LinkListSerializer,
+            queryset=link_list(user_id=request.user.pk),
+            values=self.list_values,
+            request=request,
+            view=self,
+        )
+
+
+def _link_search_state(request):
+    # Runs before the view validates the filters; an invalid collection is answered with 400 there.
+    try:
+        collection_id = int(request.query_params["collection"])
+    except (KeyError, ValueError):
+        collection_id = None
+    return link_search_state(user_id=request.user.pk, collection_id=collection_id)
+
+
+class LinkSearchApi(views.APIView):
+    """
+    API endpoint for searching the user's links. Requires authentication.
+    Query Parameters:
+        q (str): The search terms, matched against title, description and URL.
+        link_type (str): Only return links of this type.
+        collection (int): Only return links in this collection.
+        cursor (str): The ``next`` cursor of the previous page.
+    Returns:
+        The matching links, best match first, with keyset pagination.
+    Methods:
+        GET: Search links.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+
+    class Pagination(KeysetPagination):
+        ordering = ("-rank", "-id")
+
+    class LinkSearchFilterSerializer(serializers.Serializer):
+        q = serializers.CharField(max_length=255)
+        link_type = serializers.ChoiceField(choices=Link.LinkType.choices, required=False)
+        collection = serializers.IntegerField(required=False)
+
+    class LinkSearchSerializer(serializers.ModelSerializer):
+        user = inline_serializer(
+            fields={
+                "id": serializers.IntegerField(),
+                "email": serializers.EmailField(),
+            }
+        )
+        rank = serializers.FloatField()
+
+        class Meta:
+            model = Link
+            exclude = ["search_vector"]
+
+    @list_condition(_link_search_state)
+    @extend_schema(
+        parameters=[LinkSearchFilterSerializer],
+        responses={
+            200: LinkSearchSerializer,
+            401: OpenApiResponse(description="User is not authenticated"),
+        },
+        tags=["links"],
+        description="Search links by title, description and URL",
+    )
+    def get(self, request):
+        filters = self.LinkSearchFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        return get_paginated_response(
+            pagination_class=self.Pagination,
+            serializer_class=self.LinkSearchSerializer,
+            queryset=link_search(
+                user_id=request.user.pk,
+                query=filters.validated_data["q"],
+                link_type=filters.validated_data.get("link_type"),
+                collection_id=filters.validated_data.get("collection"),
+            ),
             request=request,
             view=self,
         )
 
 
+class LinkExportApi(views.APIView):
+    """
+    API endpoint for downloading all of the user's links. Requires authentication.
+    The file is streamed while it is read from the database, so its size is not limited.
+    Query Parameters:
+        file_format (str): "ndjson" (default), "csv" or "html" (Netscape bookmarks).
+    Returns:
+        The export file, with the names of each link's collections.
+    Methods:
+        GET: Download the export.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    class LinkExportFilterSerializer(serializers.Serializer):
+        file_format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="ndjson")
+
+    @extend_schema(
+        parameters=[LinkExportFilterSerializer],
+        responses={
+            (200, "application/x-ndjson"): OpenApiResponse(description="The export file"),
+            401: OpenApiResponse(description="User is not authenticated"),
+        },
+        tags=["links"],
+        description="Download all links as NDJSON, CSV or a bookmarks file",
+    )
+    def get(self, request):
+        filters = self.LinkExportFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        file_format = filters.validated_data["file_format"]
+        _, content_type, extension = EXPORT_FORMATS[file_format]
+
+        response = StreamingHttpResponse(
+            export_links(
+                user_id=request.user.pk,
+                file_format=file_format,
+                chunk_size=settings.LINK_EXPORT_CHUNK_SIZE,
+            ),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="links.{extension}"'
+        return response
+
+
+class LinkStatsApi(views.APIView):
+    """
+    API endpoint for the number of links of the user, in total and per link type.
+    Requires authentication.
+    Returns:
+        The user's link counts.
+    Methods:
+        GET: Retrieve the link counts.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    class LinkStatsSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = LinkStats
+            exclude = ["user"]
+
+    @list_condition(lambda request: link_list_state(user_id=request.user.pk))
+    @extend_schema(
+        responses={
+            200: LinkStatsSerializer,
+            401: OpenApiResponse(description="User is not authenticated"),
+        },
+        tags=["links"],
+        description="Retrieve the number of links of the user per link type",
+    )
+    def get(self, request):
+        stats = link_stats_get(user_id=request.user.pk)
+        return Response(self.LinkStatsSerializer(stats).data, status=status.HTTP_200_OK)
+
+
+class LinkLeaderboardApi(views.APIView):
+    """
+    API endpoint for the users with the most links. Requires authentication.
+    Query Parameters:
+        limit (int): The number of users to return (default 10, at most 50).
+    Returns:
+        The rank and link counts of the top users, most links first. Users are not identified,
+        the leaderboard is visible to every user.
+    Methods:
+        GET: Retrieve the leaderboard.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    class LinkLeaderboardFilterSerializer(serializers.Serializer):
+        limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+    class LinkLeaderboardSerializer(serializers.ModelSerializer):
+        rank = serializers.IntegerField()
+
+        class Meta:
+            model = LinkStats
+            fields = ["rank", "total", "website", "book", "article", "music", "video"]
+
+    @extend_schema(
+        parameters=[LinkLeaderboardFilterSerializer],
+        responses={
+            200: LinkLeaderboardSerializer(many=True),
+            401: OpenApiResponse(description="User is not authenticated"),
+        },
+        tags=["links"],
+        description="Retrieve the users with the most links",
+    )
+    def get(self, request):
+        filters = self.LinkLeaderboardFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        leaderboard = link_stats_leaderboard(limit=filters.validated_data["limit"])
+        for rank, stats in enumerate(leaderboard, start=1):
+            stats.rank = rank
+        return Response(
+            self.LinkLeaderboardSerializer(leaderboard, many=True).data, status=status.HTTP_200_OK
+        )
+
+
 class LinkGetApi(views.APIView):
     """
     API endpoint for retrieving a specific link. Requires authentication.
@@ -113,14 +438,17 @@ class LinkGetApi(views.APIView):
             fields={
                 "id": serializers.IntegerField(),
                 "email": serializers.EmailField(),
-                "password": serializers.CharField(),
             }
         )
 
         class Meta:
             model = Link
-            fields = "__all__"
+            exclude = ["search_vector"]
 
+    @object_condition(
+        lambda request, link_id: link_updated_at(user_id=request.user.pk, link_id=link_id)
+    )
+    @cache_user_response
     @extend_schema(
         request=LinkGetSerializer,
         responses={
@@ -173,10 +501,14 @@ class LinkUpdateApi(views.APIView):
         description (str): The description of the link.
         image (str): The image URL of the link.
         link_type (str): The type of the link.
+    Headers:
+        If-Match (str): Optional ETag of the link as last read; the update fails with 412
+            if the link changed since.
     Returns:
-        The HTTP response indicating the success of the link update.
+        The HTTP response indicating the success of the link update, with the new ETag.
     Methods:
         PUT: Update the specified link
+        PATCH: Update some fields of the specified link
     """
 
     permission_classes = [IsAuthenticated]
@@ -184,7 +516,15 @@ class LinkUpdateApi(views.APIView):
     class LinkUpdateSerializer(serializers.ModelSerializer):
         class Meta:
             model = Link
-            exclude = ["user", "id", "created_at", "updated_at"]
+            exclude = [
+                "user",
+                "id",
+                "created_at",
+                "updated_at",
+                "search_vector",
+                # Owned by the background enrichment job.
+                "enrichment_status",
+            ]
 
     @extend_schema(
         request=LinkUpdateSerializer,
@@ -192,14 +532,35 @@ class LinkUpdateApi(views.APIView):
             200: None,
             401: OpenApiResponse(description="User is not authenticated"),
             404: OpenApiResponse(description="User is not found"),
+            412: OpenApiResponse(description="Link was modified since it was read"),
         },
         tags=["links"],
         description="Update the specified link",
     )
     def put(self, request, link_id: int):
-        serializer = self.LinkUpdateSerializer(data=request.data)
+        return self.update(request, link_id, partial=False)
+
+    @extend_schema(
+        request=LinkUpdateSerializer(partial=True),
+        responses={
+            200: None,
+            401: OpenApiResponse(description="User is not authenticated"),
+            404: OpenApiResponse(description="User is not found"),
+            412: OpenApiResponse(description="Link was modified since it was read"),
+        },
+        tags=["links"],
+        description="Update some fields of the specified link",
+    )
+    def patch(self, request, link_id: int):
+        return self.update(request, link_id, partial=True)
+
+    def update(self, request, link_id: int, partial: bool):
+        serializer = self.LinkUpdateSerializer(data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        link_update(
-            user_id=request.user.id, link_id=link_id, **serializer.validated_data
+        link = link_update(
+            user_id=request.user.id,
+            link_id=link_id,
+            expected_updated_at=get_if_match(request),
+            **serializer.validated_data,
         )
-        return Response(status=status.HTTP_200_OK)
+        return Response(status=status.HTTP_200_OK, headers={"ETag": make_etag(link.updated_at)})
@@ -1,10 +1,26 @@
 from django.urls import path
 
-from .apis import LinkCreateApi, LinkDeleteApi, LinkGetApi, LinkListApi, LinkUpdateApi
+from .apis import (
+    LinkBulkCreateApi,
+    LinkCreateApi,
+    LinkDeleteApi,
+    LinkExportApi,
+    LinkGetApi,
+    LinkLeaderboardApi,
+    LinkListApi,
+    LinkSearchApi,
+    LinkStatsApi,
+    LinkUpdateApi,
+)
 
 urlpatterns = [
     path("", LinkCreateApi.as_view(), name="create-link"),
+    path("bulk", LinkBulkCreateApi.as_view(), name="bulk-create-link"),
     path("list", LinkListApi.as_view(), name="list-link"),
+    path("search", LinkSearchApi.as_view(), name="search-link"),
+    path("export", LinkExportApi.as_view(), name="export-link"),
+    path("stats", LinkStatsApi.as_view(), name="stats-link"),
+    path("stats/leaderboard", LinkLeaderboardApi.as_view(), name="leaderboard-link"),
     path("<int:link_id>", LinkGetApi.as_view(), name="get-link"),
     path("delete/<int:link_id>", LinkDeleteApi.as_view(), name="delete-link"),
     path("update/<int:link_id>", LinkUpdateApi.as_view(), name="update-link"),
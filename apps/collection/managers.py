@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class CollectionQuerySet(models.QuerySet):
+    def for_user(self, user_id: int) -> "CollectionQuerySet":
+        """Collections owned by the user, filtered on the indexed user_id column without joining users."""
+        return self.filter(user_id=user_id)
+
+
+class LinkCollectionQuerySet(models.QuerySet):
+    def for_user(self, user_id: int) -> "LinkCollectionQuerySet":
+        """Link collections whose collection is owned by the user."""
+        return self.filter(collection__user_id=user_id)
@@ -3,6 +3,8 @@ from django.db import models
 from apps.links.models import Link
 from apps.users.models import UserAccount
 
+from .managers import CollectionQuerySet, LinkCollectionQuerySet
+
 
 class Collection(models.Model):
     name = models.CharField(max_length=255, null=False)
@@ -11,17 +13,27 @@ class Collection(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(UserAccount, on_delete=models.CASCADE)
 
+    objects = CollectionQuerySet.as_manager()
+
     def __str__(self) -> str:
         return f"Collection: {self.name}"
 
     class Meta:
         verbose_name = "collection"
         verbose_name_plural = "collections"
+        indexes = [
+            # collection_list: WHERE user_id = %s ORDER BY created_at DESC, id DESC.
+            models.Index(fields=["user", "-created_at", "-id"], name="collection_user_created_idx"),
+            # Conditional requests: max(updated_at) and count(*) WHERE user_id = %s.
+            models.Index(fields=["user", "updated_at"], name="collection_user_updated_idx"),
+        ]
 
 class LinkCollection(models.Model):
     link = models.ForeignKey(Link, on_delete=models.CASCADE)
     collection = models.ForeignKey(Collection, on_delete=models.CASCADE)
 
+    objects = LinkCollectionQuerySet.as_manager()
+
     def __str__(self) -> str:
         return f"LinkCollection: {self.link} - {self.collection}"
 
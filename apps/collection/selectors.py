@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from django.db.models import Count, Max
+
 from apps.collection.models import Collection, LinkCollection
 from core.exceptions import NotFoundError
 from core.utils import get_object
@@ -14,9 +18,11 @@ def collection_get(*, user_id: int, collection_id: int) -> Collection:
     Raises:
         NotFoundError: If the collection does not exist or if the user does not have access to it.
     """
-    collection = get_object(Collection, id=collection_id)
+    collection = get_object(
+        Collection.objects.for_user(user_id).select_related("user"), id=collection_id
+    )
 
-    if collection is None or collection.user.id != user_id:
+    if collection is None:
         raise NotFoundError
     return collection
 
@@ -27,19 +33,84 @@ def collection_list(user_id: int) -> list[Collection] | list:
     Parameters:
         user_id (int): The ID of the user.
     Returns:
-        list[Collection]: A list of Collection objects filtered by the user ID.
+        list[Collection]: A list of Collection objects filtered by the user ID, newest first.
     """
-    collection = Collection.objects.filter(user__id=user_id)
+    collection = (
+        Collection.objects.for_user(user_id)
+        .select_related("user")
+        .order_by("-created_at", "-id")
+    )
     return collection
 
 
 def link_collection_list(user_id: int) -> list[LinkCollection] | list:
     """
-    Retrieve a list of collections for a given user ID.
+    Retrieve a list of link collections for a given user ID.
     Parameters:
         user_id (int): The ID of the user.
     Returns:
-        list[Collection]: A list of Collection objects filtered by the user ID.
+        list[LinkCollection]: A list of LinkCollection objects filtered by the user ID, newest first.
     """
-    link_collections = LinkCollection.objects.filter(collection__user__id=user_id)
+    link_collections = (
+        LinkCollection.objects.for_user(user_id)
+        .select_related("link", "collection")
+        .defer("link__search_vector")
+        .order_by("-id")
+    )
     return link_collections
+
+
+def collection_updated_at(*, user_id: int, collection_id: int) -> datetime | None:
+    """
+    Retrieve when a collection last changed, for conditional requests.
+    Args:
+        user_id (int): The ID of the user.
+        collection_id (int): The ID of the collection.
+    Returns:
+        datetime | None: The collection's updated_at, or None if the user has no such collection.
+    """
+    return (
+        Collection.objects.for_user(user_id)
+        .filter(id=collection_id)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+
+
+def collection_list_state(*, user_id: int) -> tuple[datetime | None, int]:
+    """
+    Retrieve when the user's collections last changed and how many there are, for conditional
+    requests. Both come from the (user, updated_at) index.
+    Args:
+        user_id (int): The ID of the user.
+    Returns:
+        tuple[datetime | None, int]: The time of the last change and the number of collections.
+    """
+    state = Collection.objects.for_user(user_id).aggregate(
+        updated_at=Max("updated_at"), count=Count("id")
+    )
+    return state["updated_at"], state["count"]
+
+
+def link_collection_list_state(*, user_id: int) -> tuple[datetime | None, int, int | None]:
+    """
+    Retrieve when the user's link collections last changed, how many there are and the newest
+    membership ID, for conditional requests. A membership changes with its link or its
+    collection; memberships have no timestamp, but a new one always gets a higher ID, so
+    removing one membership and adding another still changes the state.
+    Args:
+        user_id (int): The ID of the user.
+    Returns:
+        tuple[datetime | None, int, int | None]: The time of the last change, the number of
+            memberships and the newest membership ID.
+    """
+    state = LinkCollection.objects.for_user(user_id).aggregate(
+        link_updated_at=Max("link__updated_at"),
+        collection_updated_at=Max("collection__updated_at"),
+        count=Count("id"),
+        last_id=Max("id"),
+    )
+    updated_at = max(
+        filter(None, (state["link_updated_at"], state["collection_updated_at"])), default=None
+    )
+    return updated_at, state["count"], state["last_id"]
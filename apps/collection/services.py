@@ -1,8 +1,11 @@
+from datetime import datetime
+
 from apps.collection.models import Collection, LinkCollection
 from apps.links.models import Link
 from apps.users.models import UserAccount
+from core.cache import invalidate_user_responses
 from core.exceptions import NotFoundError
-from core.utils import get_object
+from core.utils import update_object
 
 
 def collection_create(*, user: UserAccount, name: str, description: str) -> Collection:
@@ -19,33 +22,40 @@ def collection_create(*, user: UserAccount, name: str, description: str) -> Coll
     collection = Collection.objects.create(
         user=user, name=name, description=description
     )
-
-    collection.save()
+    invalidate_user_responses(user.id)
     return collection
 
 
 def collection_update(
-    *, user_id: int, collection_id: str, name: str, description: str
+    *,
+    user_id: int,
+    collection_id: int,
+    expected_updated_at: datetime | None = None,
+    **fields,
 ) -> Collection:
     """
     Update a collection with the given parameters.
+    Only the columns whose value changes are written, with a single-row UPDATE.
     Args:
         user_id (int): The ID of the user who owns the collection.
-        collection_id (str): The ID of the collection to be updated.
-        name (str): The new name for the collection.
-        description (str): The new description for the collection.
+        collection_id (int): The ID of the collection to be updated.
+        expected_updated_at (datetime | None): The updated_at the client last saw (If-Match).
+        **fields: The new values, among name and description.
     Returns:
         Collection: The updated collection.
     Raises:
         NotFoundError: If the collection does not exist or if the user does not own the collection.
+        PreconditionFailedError: If the collection changed since expected_updated_at.
     """
 
-    collection: Collection = get_object(Collection, id=collection_id)
-    if collection is None or collection.user.id != user_id:
-        raise NotFoundError
-
-    collection_obj = Collection.objects.update(name=name, description=description)
-    return collection_obj
+    collection, previous = update_object(
+        Collection.objects.for_user(user_id).filter(id=collection_id),
+        fields=fields,
+        expected_updated_at=expected_updated_at,
+    )
+    if previous:
+        invalidate_user_responses(user_id)
+    return collection
 
 
 def collection_delete(user_id: int, collection_id: int) -> None:
@@ -60,11 +70,11 @@ def collection_delete(user_id: int, collection_id: int) -> None:
         None
     """
 
-    collection: Collection = get_object(Collection, id=collection_id)
+    deleted, _ = Collection.objects.for_user(user_id).filter(id=collection_id).delete()
 
-    if collection is None or collection.user.id != user_id:
+    if not deleted:
         raise NotFoundError
-    collection.delete()
+    invalidate_user_responses(user_id)
 
 
 def link_collection_create(*, user_id: int, link_id: int, collection_id: int) -> None:
@@ -80,16 +90,14 @@ def link_collection_create(*, user_id: int, link_id: int, collection_id: int) ->
         None
     """
 
-    link: Link = get_object(Link, id=link_id)
-    collection: Collection = get_object(Collection, id=collection_id)
-
-    if link is None or link.user.id != user_id:
+    if not Link.objects.for_user(user_id).filter(id=link_id).exists():
         raise NotFoundError
 
-    if collection is None or collection.user.id != user_id:
+    if not Collection.objects.for_user(user_id).filter(id=collection_id).exists():
         raise NotFoundError
 
-    link_collection = LinkCollection.objects.create(link=link, collection=collection)
-
-    link_collection.save()
+    link_collection = LinkCollection.objects.create(
+        link_id=link_id, collection_id=collection_id
+    )
+    invalidate_user_responses(user_id)
     return link_collection
@@ -0,0 +1,180 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.collection.models import Collection, LinkCollection
+from apps.links.models import Link
+from apps.users.models import UserAccount
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class CollectionReadQueriesTests(APITestCase):
+    """Query counts of the collection read endpoints; they must not grow with the number of rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.other = UserAccount.objects.create_user(email="other@example.com", password="password")
+        for user in (cls.user, cls.other):
+            collections = Collection.objects.bulk_create(
+                Collection(user=user, name=f"Collection {number}", description="Description")
+                for number in range(25)
+            )
+            links = Link.objects.bulk_create(
+                Link(user=user, link_url=f"https://example.com/{user.pk}/{number}", title=f"Link {number}")
+                for number in range(25)
+            )
+            LinkCollection.objects.bulk_create(
+                LinkCollection(link=link, collection=collection)
+                for link, collection in zip(links, collections)
+            )
+        cls.collection = Collection.objects.filter(user=cls.user).first()
+        cls.other_collection = Collection.objects.filter(user=cls.other).first()
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_get_collection(self):
+        # updated_at for the ETag, then the collection joined with its user.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("get-collection", kwargs={"collection_id": self.collection.pk})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+
+    def test_get_collection_of_other_user(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("get-collection", kwargs={"collection_id": self.other_collection.pk})
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_collections(self):
+        # State for the ETag, COUNT(*) for the count, then the page.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("list-collection"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+        self.assertTrue(all(row["user"]["id"] == self.user.pk for row in response.data["results"]))
+
+    def test_list_link_collections(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("list-link-collections"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for name in ("list-collection", "list-link-collections"):
+            for limit in (2, 20):
+                with self.subTest(name=name, limit=limit), self.assertNumQueries(3):
+                    response = self.client.get(reverse(name), {"limit": limit})
+                self.assertEqual(len(response.data["results"]), limit)
+
+    def test_replacing_a_membership_changes_the_etag(self):
+        response = self.client.get(reverse("list-link-collections"))
+        # Same count and no timestamp moves; only the newest membership ID changes.
+        membership = LinkCollection.objects.filter(collection=self.collection).get()
+        membership.delete()
+        LinkCollection.objects.create(link=membership.link, collection=self.collection)
+
+        response = self.client.get(
+            reverse("list-link-collections"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class CollectionWriteQueriesTests(APITestCase):
+    """Query counts of the collection write endpoints; other users' rows are answered with 404."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="writer@example.com", password="password")
+        cls.other = UserAccount.objects.create_user(email="other@example.com", password="password")
+        cls.collection = Collection.objects.create(user=cls.user, name="Mine", description="Mine")
+        cls.other_collection = Collection.objects.create(
+            user=cls.other, name="Theirs", description="Theirs"
+        )
+        cls.link = Link.objects.create(user=cls.user, link_url="https://example.com/mine")
+        cls.other_link = Link.objects.create(user=cls.other, link_url="https://example.com/theirs")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_create_collection(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                reverse("create-collection"), {"name": "New", "description": "New"}
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_update_collection(self):
+        # The scoped read of the changed columns, then the conditional UPDATE.
+        with self.assertNumQueries(2):
+            response = self.client.patch(
+                reverse("update-collection", kwargs={"collection_id": self.collection.pk}),
+                {"description": "Changed"},
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_collection_of_other_user(self):
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                reverse("update-collection", kwargs={"collection_id": self.other_collection.pk}),
+                {"description": "Changed"},
+            )
+        self.assertEqual(response.status_code, 404)
+        self.other_collection.refresh_from_db()
+        self.assertEqual(self.other_collection.description, "Theirs")
+
+    def test_delete_collection(self):
+        # The scoped rows to delete, the cascade to memberships, then the collection.
+        with self.assertNumQueries(3):
+            response = self.client.delete(
+                reverse("delete-collection", kwargs={"collection_id": self.collection.pk})
+            )
+        self.assertEqual(response.status_code, 204)
+
+    def test_delete_collection_of_other_user(self):
+        with self.assertNumQueries(1):
+            response = self.client.delete(
+                reverse("delete-collection", kwargs={"collection_id": self.other_collection.pk})
+            )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Collection.objects.filter(pk=self.other_collection.pk).exists())
+
+    def test_create_link_collection(self):
+        # Ownership of the link and of the collection, then the insert.
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse("create-link-collection"),
+                {"link_id": self.link.pk, "collection_id": self.collection.pk},
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_create_link_collection_with_rows_of_other_user(self):
+        for link, collection, queries in (
+            (self.other_link, self.collection, 1),
+            (self.link, self.other_collection, 2),
+        ):
+            with self.subTest(link=link.pk, collection=collection.pk), self.assertNumQueries(queries):
+                response = self.client.post(
+                    reverse("create-link-collection"),
+                    {"link_id": link.pk, "collection_id": collection.pk},
+                )
+            self.assertEqual(response.status_code, 404)
+        self.assertFalse(LinkCollection.objects.exists())
+
+    def test_update_collection_with_stale_if_match_is_rejected(self):
+        url = reverse("update-collection", kwargs={"collection_id": self.collection.pk})
+        etag = self.client.get(
+            reverse("get-collection", kwargs={"collection_id": self.collection.pk})
+        )["ETag"]
+
+        response = self.client.patch(url, {"description": "First"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(url, {"description": "Second"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.description, "First")
+
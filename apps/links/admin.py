@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import Link
+from .models import Link, LinkStats
 
 admin.site.register(Link)
+admin.site.register(LinkStats)
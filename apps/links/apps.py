@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.models.signals import post_migrate
 
 
 class LinksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.links"
+
+    def ready(self):
+        from apps.links.search import install_search_trigger
+        from core.cache import check_response_cache
+
+        post_migrate.connect(install_search_trigger, sender=self)
+        checks.register(check_response_cache, checks.Tags.caches)
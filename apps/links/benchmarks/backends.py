@@ -0,0 +1,48 @@
+from typing import Callable
+
+from core.parser import parse_metadata
+
+
+def _soup_parser(features: str) -> Callable[[bytes, str | None, str | None], dict]:
+    """
+    The BeautifulSoup pipeline that core.parser replaced: build a full tree, then search it
+    once per tag. Kept to compare parser backends.
+    """
+    from bs4 import BeautifulSoup
+
+    def parse(content: bytes, encoding: str | None = None, base_url: str | None = None) -> dict:
+        soup = BeautifulSoup(content, features, from_encoding=encoding)
+
+        og_title = soup.find("meta", property="og:title")
+        og_description = soup.find("meta", property="og:description")
+        og_image = soup.find("meta", property="og:image")
+        og_type = soup.find("meta", property="og:type")
+        title_tag = soup.find("title")
+        meta_description = soup.find("meta", attrs={"name": "description"})
+
+        return {
+            "title": (og_title or {}).get("content") or (title_tag.text if title_tag else None),
+            "description": (og_description or {}).get("content")
+            or (meta_description or {}).get("content"),
+            "image": (og_image or {}).get("content"),
+            "type": (og_type or {}).get("content"),
+        }
+
+    return parse
+
+
+def get_backends() -> dict[str, Callable[[bytes, str | None, str | None], dict]]:
+    """Returns the available parser backends by name; BeautifulSoup ones only when installed."""
+    backends = {"extractor": parse_metadata}
+
+    try:
+        backends["soup"] = _soup_parser("html.parser")
+    except ImportError:
+        return backends
+
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return backends
+    backends["soup-lxml"] = _soup_parser("lxml")
+    return backends
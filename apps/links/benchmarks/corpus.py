@@ -0,0 +1,54 @@
+from pathlib import Path
+from typing import NamedTuple
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+
+HTML_UTF8 = "text/html; charset=utf-8"
+
+
+class Page(NamedTuple):
+    name: str
+    content_type: str
+    body: bytes
+
+    @property
+    def is_html(self) -> bool:
+        return self.content_type.startswith("text/html")
+
+
+def _read(name: str) -> bytes:
+    return (PAGES_DIR / name).read_bytes()
+
+
+def _huge_body(size: int) -> bytes:
+    article = _read("article.html")
+    head, _, _ = article.partition(b"<body>")
+    paragraph = (
+        b"<p>Lorem ipsum dolor sit amet, <a href='/x'>consectetur</a> adipiscing elit, "
+        b"sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>\n"
+    )
+    body = paragraph * (size // len(paragraph))
+    return head + b"<body><main>" + body + b"</main></body></html>"
+
+
+def _huge_head(size: int) -> bytes:
+    article = _read("article.html")
+    inline_script = b"<script>var state = " + b"[" + b"1234567890," * (size // 11) + b"0];</script>\n"
+    return article.replace(b"</head>", inline_script + b"</head>", 1)
+
+
+def load_corpus() -> list[Page]:
+    """
+    Returns the benchmark corpus: the hand-written pages in pages/ plus generated
+    large and binary documents that would bloat the repository.
+    """
+    return [
+        Page("tiny", HTML_UTF8, _read("tiny.html")),
+        Page("article", HTML_UTF8, _read("article.html")),
+        Page("no_og", "text/html", _read("no_og.html")),
+        Page("malformed", "text/html", _read("malformed.html")),
+        Page("huge_body", HTML_UTF8, _huge_body(8 * 1024 * 1024)),
+        Page("huge_head", HTML_UTF8, _huge_head(1024 * 1024)),
+        Page("pdf_octet_stream", "application/octet-stream", b"%PDF-1.7\n" + b"\0" * (4 * 1024 * 1024)),
+        Page("video", "video/mp4", b"\0\0\0\x18ftypisom" + b"\0" * (16 * 1024 * 1024)),
+    ]
@@ -0,0 +1,338 @@
+import time
+import uuid
+from typing import Any, Callable, Iterator, NamedTuple
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.collection.models import Collection
+from apps.links.benchmarks.timing import percentile
+from apps.users.models import PasswordReset, UserAccount
+
+# Routes the driver does not call: the admin uses session authentication and CSRF tokens.
+EXCLUDED_ROUTES = ("api/admin/",)
+
+
+class Step(NamedTuple):
+    """
+    One request of a scenario iteration.
+    request receives the iteration state and returns (method, path, data); check receives the
+    state and the response, and stores what later steps need (IDs, tokens).
+    """
+
+    label: str
+    request: Callable[[dict], tuple[str, str, Any]]
+    expected: tuple[int, ...] = (200,)
+    authenticated: bool = True
+    check: Callable[[dict, Any], None] | None = None
+
+
+def _store_link(state: dict, response) -> None:
+    state["link_ids"].append(response.json()["id"])
+
+
+def _store_bulk_links(state: dict, response) -> None:
+    state["link_ids"].extend(row["id"] for row in response.json() if row["status"] == "created")
+
+
+def _store_tokens(state: dict, response) -> None:
+    state["refresh"] = response.json()["refresh"]
+
+
+def _store_collection(state: dict, response) -> None:
+    # The create endpoint answers 201 without a body.
+    state["collection_id"] = Collection.objects.filter(user=state["user"]).latest("id").id
+
+
+def _store_reset_token(state: dict, response) -> None:
+    state["reset_token"] = PasswordReset.objects.filter(user_id=state["user"].pk).latest("id").token
+
+
+def _delete_links(state: dict) -> Iterator[tuple[str, str, Any]]:
+    for link_id in state["link_ids"]:
+        yield "delete", reverse("delete-link", kwargs={"link_id": link_id}), None
+
+
+# The order matters: later steps use what earlier ones created, and every iteration
+# deletes what it created, so the dataset keeps its size however long the run is.
+STEPS: tuple[Step, ...] = (
+    Step(
+        "create-user",
+        lambda s: (
+            "post",
+            reverse("create-user"),
+            {"email": f"load-{s['run']}-{s['iteration']}@example.com", "password": s["password"]},
+        ),
+        expected=(201,),
+        authenticated=False,
+    ),
+    Step(
+        "token_obtain_pair",
+        lambda s: (
+            "post",
+            reverse("token_obtain_pair"),
+            {"email": s["user"].email, "password": s["password"]},
+        ),
+        expected=(201,),
+        authenticated=False,
+        check=_store_tokens,
+    ),
+    Step(
+        "token_refresh",
+        lambda s: ("post", reverse("token_refresh"), {"refresh": s["refresh"]}),
+        authenticated=False,
+    ),
+    Step(
+        "create-link",
+        lambda s: ("post", reverse("create-link"), {"link": s["url"]("single")}),
+        expected=(201, 202),
+        check=_store_link,
+    ),
+    Step(
+        "bulk-create-link",
+        lambda s: (
+            "post",
+            reverse("bulk-create-link"),
+            {"links": [s["url"](f"bulk-{n}") for n in range(5)]},
+        ),
+        expected=(201, 202),
+        check=_store_bulk_links,
+    ),
+    Step(
+        "get-link",
+        lambda s: ("get", reverse("get-link", kwargs={"link_id": s["link_ids"][0]}), None),
+    ),
+    Step(
+        "update-link",
+        lambda s: (
+            "patch",
+            reverse("update-link", kwargs={"link_id": s["link_ids"][0]}),
+            {"title": f"Load test {s['iteration']}"},
+        ),
+    ),
+    Step("list-link", lambda s: ("get", reverse("list-link"), None)),
+    Step("list-link?offset", lambda s: ("get", reverse("list-link"), {"offset": 20, "limit": 20})),
+    Step("list-link?count=false", lambda s: ("get", reverse("list-link"), {"count": "false"})),
+    Step("list-link?cursor", lambda s: ("get", reverse("list-link"), {"cursor": ""})),
+    Step("search-link", lambda s: ("get", reverse("search-link"), {"q": s["query"]})),
+    Step("stats-link", lambda s: ("get", reverse("stats-link"), None)),
+    Step("leaderboard-link", lambda s: ("get", reverse("leaderboard-link"), None)),
+    Step("export-link", lambda s: ("get", reverse("export-link"), {"file_format": "ndjson"})),
+    Step(
+        "create-collection",
+        lambda s: (
+            "post",
+            reverse("create-collection"),
+            {"name": f"Load test {s['iteration']}", "description": "Created by load_test"},
+        ),
+        expected=(201,),
+        check=_store_collection,
+    ),
+    Step(
+        "get-collection",
+        lambda s: (
+            "get",
+            reverse("get-collection", kwargs={"collection_id": s["collection_id"]}),
+            None,
+        ),
+    ),
+    Step("list-collection", lambda s: ("get", reverse("list-collection"), None)),
+    Step(
+        "update-collection",
+        lambda s: (
+            "patch",
+            reverse("update-collection", kwargs={"collection_id": s["collection_id"]}),
+            {"description": "Updated by load_test"},
+        ),
+    ),
+    Step(
+        "create-link-collection",
+        lambda s: (
+            "post",
+            reverse("create-link-collection"),
+            {"link_id": s["link_ids"][0], "collection_id": s["collection_id"]},
+        ),
+        expected=(201,),
+    ),
+    Step("list-link-collections", lambda s: ("get", reverse("list-link-collections"), None)),
+    Step(
+        "delete-collection",
+        lambda s: (
+            "delete",
+            reverse("delete-collection", kwargs={"collection_id": s["collection_id"]}),
+            None,
+        ),
+        expected=(204,),
+    ),
+    Step("delete-link", _delete_links, expected=(204,)),
+    Step(
+        "change-password",
+        lambda s: (
+            "put",
+            reverse("change-password"),
+            {"old_password": s["password"], "new_password": s["password"]},
+        ),
+    ),
+    Step(
+        "reset-password",
+        lambda s: ("post", reverse("reset-password"), {"email": s["user"].email}),
+        check=_store_reset_token,
+    ),
+    Step(
+        "reset-password-new",
+        lambda s: (
+            "post",
+            reverse("reset-password", kwargs={"token": s["reset_token"]}),
+            {"password": s["password"]},
+        ),
+        expected=(201,),
+    ),
+    Step("schema", lambda s: ("get", reverse("schema"), None)),
+    Step("swagger-ui", lambda s: ("get", reverse("swagger-ui"), None)),
+    Step("redoc", lambda s: ("get", reverse("redoc"), None)),
+)
+
+
+def iter_routes(resolver: URLResolver | None = None, prefix: str = "") -> Iterator[str]:
+    """Yields the full route of every URL pattern, e.g. "api/v1/links/<int:link_id>"."""
+    for pattern in (resolver or get_resolver()).url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLPattern):
+            yield route
+        elif not route.startswith(EXCLUDED_ROUTES):
+            yield from iter_routes(pattern, route)
+
+
+class Sample(NamedTuple):
+    seconds: float
+    queries: int
+    status: int
+    ok: bool
+
+
+class LoadDriver:
+    """
+    Runs the scenario in STEPS against the URLconf in-process through Django's test client,
+    as a set of existing users authenticated with JWT access tokens. Every request records
+    its latency, the number of queries it ran on the default connection and its status.
+    Background jobs (link enrichment) run on their own connections and are not counted.
+    Args:
+        users (list[UserAccount]): The users to act as, round robin per iteration.
+        password (str): Their password, for the login and password endpoints.
+        url (Callable[[str], str]): Builds the URL of a new link from a unique name;
+            pointed at a local stub so Open Graph fetches never leave the machine.
+        queries (list[str]): Search terms, round robin per iteration.
+    """
+
+    def __init__(
+        self,
+        *,
+        users: list[UserAccount],
+        password: str,
+        url: Callable[[str], str],
+        queries: list[str],
+    ) -> None:
+        self.users = users
+        self.password = password
+        self.url = url
+        self.queries = queries
+        self.run = uuid.uuid4().hex[:8]
+        self.anonymous = Client(raise_request_exception=False)
+        self.clients = {
+            user.pk: Client(
+                raise_request_exception=False,
+                headers={"authorization": f"Bearer {RefreshToken.for_user(user).access_token}"},
+            )
+            for user in users
+        }
+        self.samples: dict[str, list[Sample]] = {step.label: [] for step in STEPS}
+        self.skipped: dict[str, int] = {}
+        self.routes: set[str] = set()
+        self.elapsed = 0.0
+        self._iteration = 0
+
+    def iterate(self, *, record: bool = True) -> None:
+        user = self.users[self._iteration % len(self.users)]
+        iteration = str(self._iteration)
+        state = {
+            "run": self.run,
+            "iteration": iteration,
+            "user": user,
+            "password": self.password,
+            "query": self.queries[self._iteration % len(self.queries)],
+            "url": lambda name: self.url(f"load-{self.run}-{iteration}-{name}"),
+            "link_ids": [],
+        }
+        self._iteration += 1
+
+        for step in STEPS:
+            client = self.clients[user.pk] if step.authenticated else self.anonymous
+            try:
+                requests = step.request(state)
+            except LookupError:
+                # An earlier step failed to create what this one needs.
+                if record:
+                    self.skipped[step.label] = self.skipped.get(step.label, 0) + 1
+                continue
+            for method, path, data in requests if isinstance(requests, Iterator) else [requests]:
+                sample, response = self.send(client, method, path, data, step.expected)
+                if record:
+                    self.samples[step.label].append(sample)
+                    self.routes.add(resolve(path).route)
+                if sample.ok and step.check is not None:
+                    step.check(state, response)
+
+    def send(
+        self, client: Client, method: str, path: str, data: Any, expected: tuple[int, ...]
+    ) -> tuple[Sample, Any]:
+        kwargs = {"data": data}
+        if method != "get":
+            kwargs["content_type"] = "application/json"
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            seconds = time.perf_counter() - started
+        self.elapsed += seconds
+        ok = response.status_code in expected
+        return Sample(seconds, len(queries), response.status_code, ok), response
+
+    def cleanup(self) -> int:
+        """Deletes the users the create-user step signed up; returns how many."""
+        deleted, _ = UserAccount.objects.filter(email__startswith=f"load-{self.run}-").delete()
+        return deleted
+
+    def uncovered_routes(self) -> list[str]:
+        return sorted(set(iter_routes()) - self.routes)
+
+    def results(self) -> list[dict]:
+        results = []
+        for label, samples in self.samples.items():
+            if not samples:
+                continue
+            latencies = sorted(sample.seconds for sample in samples)
+            statuses: dict[int, int] = {}
+            for sample in samples:
+                statuses[sample.status] = statuses.get(sample.status, 0) + 1
+            results.append(
+                {
+                    "endpoint": label,
+                    "requests": len(samples),
+                    "errors": sum(not sample.ok for sample in samples),
+                    "skipped": self.skipped.get(label, 0),
+                    "statuses": statuses,
+                    "p50_ms": percentile(latencies, 0.50) * 1000,
+                    "p95_ms": percentile(latencies, 0.95) * 1000,
+                    "p99_ms": percentile(latencies, 0.99) * 1000,
+                    "requests_per_second": len(latencies) / max(sum(latencies), 1e-9),
+                    "mean_queries": sum(sample.queries for sample in samples) / len(samples),
+                    "max_queries": max(sample.queries for sample in samples),
+                }
+            )
+        return results
@@ -0,0 +1,71 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+
+from apps.links.benchmarks.corpus import Page
+
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class CorpusServer:
+    """
+    Serves pages on 127.0.0.1 from a background thread, so fetch benchmarks and load tests
+    never touch the network. Page "name" is served at /name; any other path is answered
+    with the fallback page when one is given and 404 otherwise.
+    Usage:
+        with CorpusServer(load_corpus()) as server:
+            download_open_graph_data(server.url("article"))
+    """
+
+    def __init__(self, pages: Iterable[Page], fallback: Page | None = None) -> None:
+        self.pages = {f"/{page.name}": page for page in pages}
+        self.fallback = fallback
+        self.requests = 0
+        self._server: ThreadingHTTPServer | None = None
+
+    def __enter__(self) -> "CorpusServer":
+        corpus = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle's algorithm the body of
+            # a small page waits for the client's delayed ACK of the headers (~40 ms).
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                corpus.requests += 1
+                page = corpus.pages.get(self.path.split("?", 1)[0], corpus.fallback)
+                if page is None:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", page.content_type)
+                self.send_header("Content-Length", str(len(page.body)))
+                self.end_headers()
+                try:
+                    for start in range(0, len(page.body), WRITE_CHUNK_SIZE):
+                        self.wfile.write(page.body[start : start + WRITE_CHUNK_SIZE])
+                except ConnectionError:
+                    # The fetcher stops reading at </head> and hangs up.
+                    self.close_connection = True
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, name: str) -> str:
+        return f"{self.base_url}/{name}"
@@ -0,0 +1,40 @@
+import time
+import tracemalloc
+from typing import Callable
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict:
+    """
+    Time func over several iterations, then record the peak memory of one extra run
+    (measured separately because tracemalloc slows the code down).
+    """
+    func()  # warm up connections, imports and caches
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        func()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "ops_per_second": iterations / elapsed,
+        "peak_memory_kb": peak_memory / 1024,
+    }
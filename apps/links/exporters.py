@@ -0,0 +1,128 @@
+import csv
+import json
+from html import escape
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.collection.models import LinkCollection
+from apps.links.models import Link
+
+EXPORT_FIELDS = (
+    "id",
+    "link_url",
+    "title",
+    "description",
+    "image",
+    "link_type",
+    "enrichment_status",
+    "created_at",
+    "updated_at",
+)
+
+
+def iter_link_chunks(*, user_id: int, chunk_size: int) -> Iterator[list[dict]]:
+    """
+    Read all links of a user in chunks, each link with the names of its collections.
+    Links are streamed from a server-side cursor and the memberships of every chunk are fetched
+    with one query, so memory stays bounded by chunk_size however many links the user has.
+    Args:
+        user_id (int): The ID of the user.
+        chunk_size (int): The number of links per chunk.
+    Yields:
+        list[dict]: The links of the chunk, with a "collections" list.
+    """
+    rows = (
+        Link.objects.for_user(user_id)
+        .order_by("id")
+        .values(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    while chunk := list(islice(rows, chunk_size)):
+        collections = {}
+        memberships = (
+            LinkCollection.objects.filter(link_id__in=[row["id"] for row in chunk])
+            .order_by("collection__name")
+            .values_list("link_id", "collection__name")
+        )
+        for link_id, name in memberships:
+            collections.setdefault(link_id, []).append(name)
+
+        for row in chunk:
+            row["collections"] = collections.get(row["id"], [])
+        yield chunk
+
+
+def write_ndjson(chunks: Iterable[list[dict]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in chunk)
+
+
+class _Buffer:
+    """File-like object for csv.writer that hands back what is written instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def write_csv(chunks: Iterable[list[dict]]) -> Iterator[str]:
+    writer = csv.writer(_Buffer())
+    yield writer.writerow([*EXPORT_FIELDS, "collections"])
+    for chunk in chunks:
+        yield "".join(
+            writer.writerow([*(row[field] for field in EXPORT_FIELDS), ";".join(row["collections"])])
+            for row in chunk
+        )
+
+
+BOOKMARKS_HEADER = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+"""
+
+
+def _bookmark(row: dict) -> str:
+    attrs = (
+        f'HREF="{escape(row["link_url"] or "")}" '
+        f'ADD_DATE="{int(row["created_at"].timestamp())}" '
+        f'LAST_MODIFIED="{int(row["updated_at"].timestamp())}"'
+    )
+    if row["collections"]:
+        attrs += f' TAGS="{escape(",".join(row["collections"]))}"'
+    bookmark = f"    <DT><A {attrs}>{escape(row['title'] or row['link_url'] or '')}</A>\n"
+    if row["description"]:
+        bookmark += f"    <DD>{escape(row['description'])}\n"
+    return bookmark
+
+
+def write_bookmarks_html(chunks: Iterable[list[dict]]) -> Iterator[str]:
+    """Netscape bookmarks file as read by browsers; collections become TAGS."""
+    yield BOOKMARKS_HEADER
+    for chunk in chunks:
+        yield "".join(_bookmark(row) for row in chunk)
+    yield "</DL><p>\n"
+
+
+# Format name: (writer, content type, file extension)
+EXPORT_FORMATS: dict[str, tuple[Callable, str, str]] = {
+    "ndjson": (write_ndjson, "application/x-ndjson", "ndjson"),
+    "csv": (write_csv, "text/csv; charset=utf-8", "csv"),
+    "html": (write_bookmarks_html, "text/html; charset=utf-8", "html"),
+}
+
+
+def export_links(*, user_id: int, file_format: str, chunk_size: int) -> Iterator[str]:
+    """
+    Export all links of a user as a stream of text pieces.
+    Args:
+        user_id (int): The ID of the user.
+        file_format (str): One of EXPORT_FORMATS.
+        chunk_size (int): The number of links read per database round trip.
+    Returns:
+        Iterator[str]: The pieces of the file, one per chunk of links.
+    """
+    writer = EXPORT_FORMATS[file_format][0]
+    return writer(iter_link_chunks(user_id=user_id, chunk_size=chunk_size))
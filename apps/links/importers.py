@@ -0,0 +1,84 @@
+import json
+from html.parser import HTMLParser
+
+from core.exceptions import InvalidImportFileError
+
+
+class BookmarksParser(HTMLParser):
+    """Collects the HREF of every <A> tag in a Netscape bookmarks file."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.urls: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != "a":
+            return
+        href = dict(attrs).get("href")
+        if href:
+            self.urls.append(href.strip())
+
+
+def parse_bookmarks_html(content: str) -> list[str]:
+    """
+    Extract URLs from a Netscape bookmarks file, as exported by browsers and bookmark managers.
+    Args:
+        content (str): The content of the file.
+    Returns:
+        list[str]: The URLs in the order they appear in the file.
+    """
+    parser = BookmarksParser()
+    parser.feed(content)
+    parser.close()
+    return parser.urls
+
+
+def parse_bookmarks_json(content: str) -> list[str]:
+    """
+    Extract URLs from a JSON file.
+    Accepts a list of URLs, a list of objects with a "url", "link" or "link_url" key,
+    or an object holding such a list under "links".
+    Args:
+        content (str): The content of the file.
+    Returns:
+        list[str]: The URLs in the order they appear in the file.
+    Raises:
+        InvalidImportFileError: If the file is not valid JSON or has an unknown layout.
+    """
+    try:
+        data = json.loads(content)
+    except ValueError:
+        raise InvalidImportFileError
+
+    if isinstance(data, dict):
+        data = data.get("links")
+    if not isinstance(data, list):
+        raise InvalidImportFileError
+
+    urls = []
+    for item in data:
+        if isinstance(item, dict):
+            item = item.get("url") or item.get("link") or item.get("link_url")
+        if isinstance(item, str) and item.strip():
+            urls.append(item.strip())
+    return urls
+
+
+def parse_import_file(content: bytes) -> list[str]:
+    """
+    Extract URLs from an uploaded JSON or Netscape bookmarks file.
+    Args:
+        content (bytes): The raw content of the file.
+    Returns:
+        list[str]: The URLs found in the file.
+    Raises:
+        InvalidImportFileError: If the file can not be decoded or parsed.
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise InvalidImportFileError
+
+    if text.lstrip()[:1] in ("[", "{"):
+        return parse_bookmarks_json(text)
+    return parse_bookmarks_html(text)
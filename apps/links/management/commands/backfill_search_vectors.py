@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.links.search import backfill_search_vectors, install_search_trigger
+
+
+class Command(BaseCommand):
+    help = "Compute the full-text search vector of links saved before the search trigger was installed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, batch_size, **options):
+        install_search_trigger()
+        updated = backfill_search_vectors(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {updated} links"))
@@ -0,0 +1,71 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.collection_api.apis import CollectionListApi, LinkCollectionListApi
+from api.v1.link_api.apis import LinkListApi
+from apps.collection.selectors import collection_list, link_collection_list
+from apps.links.benchmarks.timing import measure
+from apps.links.selectors import link_list
+from core.renderers import ORJSONRenderer
+from core.utils import nest_values
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the serializer and the .values() fast path of the list endpoints "
+        "on one page of a user's data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, help="Defaults to the user with the most links.")
+        parser.add_argument("--limit", type=int, default=100, help="Rows per page.")
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, user_id, limit, iterations, **options):
+        User = get_user_model()
+        if user_id is None:
+            user = User.objects.annotate(link_count=Count("link")).order_by("-link_count").first()
+            if user is None:
+                raise CommandError("No users found")
+            user_id = user.pk
+        elif not User.objects.filter(pk=user_id).exists():
+            raise CommandError(f"User {user_id} does not exist")
+
+        endpoints = (
+            ("links", LinkListApi, LinkListApi.LinkListSerializer, link_list),
+            ("collections", CollectionListApi, CollectionListApi.CollectionListSerializer, collection_list),
+            (
+                "collection-links",
+                LinkCollectionListApi,
+                LinkCollectionListApi.LinkCollectionListSerializer,
+                link_collection_list,
+            ),
+        )
+
+        header = f"{'endpoint':<17} {'path':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak KB':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for name, view, serializer_class, selector in endpoints:
+            queryset = selector(user_id=user_id)
+
+            def serialized(queryset=queryset, serializer_class=serializer_class):
+                return JSONRenderer().render(serializer_class(queryset[:limit], many=True).data)
+
+            def projected(queryset=queryset, values=view.list_values):
+                return ORJSONRenderer().render(nest_values(queryset.values(*values)[:limit]))
+
+            if json.loads(serialized()) != json.loads(projected()):
+                self.stderr.write(self.style.WARNING(f"{name}: the two paths return different bodies"))
+
+            for path, func in (("serializer", serialized), ("values", projected)):
+                result = measure(func, iterations)
+                self.stdout.write(
+                    f"{name:<17} {path:<10} "
+                    f"{result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+                    f"{result['ops_per_second']:>9.1f} {result['peak_memory_kb']:>10.1f}"
+                )
@@ -0,0 +1,101 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.links.benchmarks.backends import get_backends
+from apps.links.benchmarks.corpus import load_corpus
+from apps.links.benchmarks.server import CorpusServer
+from apps.links.benchmarks.timing import measure
+from core.utils import download_open_graph_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the Open Graph fetch and parse pipeline against a local corpus of pages. "
+        "Runs without network access."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument(
+            "--page", action="append", dest="pages", help="Only run this page (repeatable)."
+        )
+        parser.add_argument(
+            "--backend", action="append", dest="backends", help="Only run this parser backend (repeatable)."
+        )
+        parser.add_argument("--json", dest="json_path", help="Write the results to this file.")
+        parser.add_argument(
+            "--baseline", help="Compare against the results file of an earlier run and fail on regressions."
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.25,
+            help="Allowed p50 slowdown relative to the baseline (0.25 = 25%%).",
+        )
+
+    def handle(self, *args, iterations, pages, backends, json_path, baseline, max_regression, **options):
+        corpus = [page for page in load_corpus() if not pages or page.name in pages]
+        parsers = {
+            name: parse for name, parse in get_backends().items() if not backends or name in backends
+        }
+        if not corpus:
+            raise CommandError("No pages selected")
+
+        results = []
+        with CorpusServer(corpus) as server:
+            for page in corpus:
+                url = server.url(page.name)
+                result = measure(lambda: download_open_graph_data(url), iterations)
+                results.append({"stage": "fetch", "page": page.name, "backend": "pipeline", **result})
+
+        for page in corpus:
+            if not page.is_html:
+                continue
+            for name, parse in parsers.items():
+                result = measure(lambda: parse(page.body, None, "http://127.0.0.1/"), iterations)
+                result["mb_per_second"] = result["ops_per_second"] * len(page.body) / 1024 / 1024
+                results.append({"stage": "parse", "page": page.name, "backend": name, **result})
+
+        self.write_table(results)
+
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump({"iterations": iterations, "results": results}, f, indent=4)
+
+        if baseline:
+            self.compare(results, baseline, max_regression)
+
+    def write_table(self, results: list[dict]) -> None:
+        header = f"{'stage':<6} {'page':<17} {'backend':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak KB':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for result in results:
+            self.stdout.write(
+                f"{result['stage']:<6} {result['page']:<17} {result['backend']:<10} "
+                f"{result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+                f"{result['ops_per_second']:>9.1f} {result['peak_memory_kb']:>10.1f}"
+            )
+
+    def compare(self, results: list[dict], baseline_path: str, max_regression: float) -> None:
+        with open(baseline_path) as f:
+            baseline = {
+                (result["stage"], result["page"], result["backend"]): result
+                for result in json.load(f)["results"]
+            }
+
+        regressions = []
+        for result in results:
+            previous = baseline.get((result["stage"], result["page"], result["backend"]))
+            if previous is None:
+                continue
+            limit = previous["p50_ms"] * (1 + max_regression)
+            if result["p50_ms"] > limit:
+                regressions.append(
+                    f"{result['stage']} {result['page']} {result['backend']}: "
+                    f"p50 {previous['p50_ms']:.3f} ms -> {result['p50_ms']:.3f} ms"
+                )
+
+        if regressions:
+            raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from apps.links.models import Link
+from apps.links.services import link_enrich
+
+
+class Command(BaseCommand):
+    help = "Fetch Open Graph data for links that are still pending (e.g. after a worker restart)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Maximum number of links to process."
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Move failed links back to pending before processing.",
+        )
+
+    def handle(self, *args, limit, retry_failed, **options):
+        if retry_failed:
+            retried = Link.objects.filter(
+                enrichment_status=Link.EnrichmentStatus.FAILED
+            ).update(enrichment_status=Link.EnrichmentStatus.PENDING)
+            self.stdout.write(f"Moved {retried} failed links back to pending")
+
+        link_ids = Link.objects.filter(
+            enrichment_status=Link.EnrichmentStatus.PENDING
+        ).order_by("id").values_list("id", flat=True)
+        if limit is not None:
+            link_ids = link_ids[:limit]
+
+        processed = 0
+        for link_id in link_ids.iterator():
+            link_enrich(link_id=link_id)
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} pending links"))
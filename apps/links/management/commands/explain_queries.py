@@ -0,0 +1,140 @@
+from functools import partial
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+
+from apps.collection.models import Collection, LinkCollection
+from apps.collection.selectors import (
+    collection_list,
+    collection_list_state,
+    collection_updated_at,
+    link_collection_list,
+    link_collection_list_state,
+)
+from apps.links.models import Link
+from apps.links.selectors import (
+    link_list,
+    link_list_state,
+    link_search,
+    link_search_state,
+    link_stats_get,
+    link_stats_leaderboard,
+    link_updated_at,
+)
+from apps.users.models import PasswordReset, UserAccount
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the queries issued by the selectors and services and flag "
+        "sequential scans. PostgreSQL only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, help="Defaults to the first user.")
+        parser.add_argument(
+            "--allow-seqscan",
+            action="store_true",
+            help=(
+                "Keep the planner's choice. By default sequential scans are disabled so that on a "
+                "small database a Seq Scan is only reported when no index can serve the query."
+            ),
+        )
+        parser.add_argument("--analyze", action="store_true", help="Run EXPLAIN ANALYZE.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan.")
+
+    def get_queries(self, user_id: int) -> list[tuple[str, QuerySet | Callable]]:
+        """
+        The queries to explain, by name: querysets, or selectors that are called with their
+        queries captured, for those returning values (aggregates, lists) instead of querysets.
+        """
+        link_id = Link.objects.for_user(user_id).values_list("id", flat=True).first() or 0
+        collection_id = (
+            Collection.objects.for_user(user_id).values_list("id", flat=True).first() or 0
+        )
+        return [
+            ("link_get", Link.objects.for_user(user_id).select_related("user").filter(id=link_id)),
+            ("link_list", link_list(user_id=user_id)[:10]),
+            ("link_list_state", partial(link_list_state, user_id=user_id)),
+            ("link_updated_at", partial(link_updated_at, user_id=user_id, link_id=link_id)),
+            ("link_search", link_search(user_id=user_id, query="python")[:10]),
+            (
+                "link_search (collection)",
+                link_search(user_id=user_id, query="python", collection_id=collection_id)[:10],
+            ),
+            (
+                "link_search_state (collection)",
+                partial(link_search_state, user_id=user_id, collection_id=collection_id),
+            ),
+            ("link_stats_get", partial(link_stats_get, user_id=user_id)),
+            ("link_stats_leaderboard", partial(link_stats_leaderboard, limit=10)),
+            ("link_create (duplicate check)", Link.objects.for_user(user_id).filter(link_url="https://example.com/")),
+            ("enrich_links", Link.objects.filter(enrichment_status=Link.EnrichmentStatus.PENDING).order_by("id")),
+            (
+                "collection_get",
+                Collection.objects.for_user(user_id).select_related("user").filter(id=collection_id),
+            ),
+            ("collection_list", collection_list(user_id=user_id)[:10]),
+            ("collection_list_state", partial(collection_list_state, user_id=user_id)),
+            (
+                "collection_updated_at",
+                partial(collection_updated_at, user_id=user_id, collection_id=collection_id),
+            ),
+            ("link_collection_list", link_collection_list(user_id=user_id)[:10]),
+            ("link_collection_list_state", partial(link_collection_list_state, user_id=user_id)),
+            (
+                "link_collection_create (membership)",
+                LinkCollection.objects.filter(link_id=link_id, collection_id=collection_id),
+            ),
+            ("password_reset (token)", PasswordReset.objects.filter(token="token")),
+        ]
+
+    def handle(self, *args, user_id, allow_seqscan, analyze, verbose_plans, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("explain_queries needs a PostgreSQL database")
+
+        if user_id is None:
+            user_id = UserAccount.objects.order_by("id").values_list("id", flat=True).first()
+            if user_id is None:
+                raise CommandError("No users found")
+
+        flagged = []
+        # The transaction scopes SET LOCAL and rolls back the writes of EXPLAIN ANALYZE.
+        with transaction.atomic():
+            if not allow_seqscan:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, query in self.get_queries(user_id):
+                plan = "\n".join(self.explain(query, analyze=analyze))
+                seq_scans = [line.strip() for line in plan.splitlines() if "Seq Scan" in line]
+                if seq_scans:
+                    flagged.append(name)
+                    self.stdout.write(self.style.WARNING(f"{name}: sequential scan"))
+                    for line in seq_scans:
+                        self.stdout.write(f"    {line}")
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+                if verbose_plans:
+                    self.stdout.write(plan + "\n")
+
+            transaction.set_rollback(True)
+
+        if flagged:
+            raise CommandError(f"Sequential scans in: {', '.join(flagged)}")
+
+    def explain(self, query: QuerySet | Callable, *, analyze: bool) -> list[str]:
+        if isinstance(query, QuerySet):
+            return [query.explain(analyze=analyze)]
+
+        with CaptureQueriesContext(connection) as captured:
+            query()
+        plans = []
+        with connection.cursor() as cursor:
+            for executed in captured.captured_queries:
+                cursor.execute(f"EXPLAIN {'ANALYZE ' if analyze else ''}{executed['sql']}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+        return plans
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.links.exporters import EXPORT_FORMATS, export_links
+from apps.users.models import UserAccount
+
+
+class Command(BaseCommand):
+    help = "Export all links of a user, with their collections, as NDJSON, CSV or a bookmarks file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="The email of the user.")
+        parser.add_argument("--format", dest="file_format", choices=list(EXPORT_FORMATS), default="ndjson")
+        parser.add_argument("--output", help="Write to this file instead of stdout.")
+        parser.add_argument("--chunk-size", type=int, default=settings.LINK_EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, email, file_format, output, chunk_size, **options):
+        user_id = UserAccount.objects.filter(email=email).values_list("id", flat=True).first()
+        if user_id is None:
+            raise CommandError(f"No user with email {email}")
+
+        pieces = export_links(user_id=user_id, file_format=file_format, chunk_size=chunk_size)
+        if output is None:
+            for piece in pieces:
+                self.stdout.write(piece, ending="")
+            return
+
+        with open(output, "w", encoding="utf-8", newline="") as f:
+            for piece in pieces:
+                f.write(piece)
+        self.stderr.write(self.style.SUCCESS(f"Exported links of {email} to {output}"))
@@ -0,0 +1,224 @@
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Model
+from django.utils import timezone
+
+from apps.collection.models import Collection, LinkCollection
+from apps.links.models import Link
+from apps.users.models import UserAccount
+from core.bulk_loader import BulkLoader
+
+WORDS = (
+    "python django postgres index query cache latency design pattern guide review "
+    "music album live session video talk lecture course book chapter novel history "
+    "science climate energy travel city food recipe coffee garden photo camera film "
+    "startup product market team remote work health sleep running cycling chess game "
+    "space rocket ocean mountain forest river language art museum poetry"
+).split()
+
+HOSTS = (
+    "github.com",
+    "medium.com",
+    "youtube.com",
+    "en.wikipedia.org",
+    "news.ycombinator.com",
+    "open.spotify.com",
+    "goodreads.com",
+    "arxiv.org",
+    "nytimes.com",
+    "dev.to",
+)
+
+# Share of each link type; most saved links are plain websites.
+LINK_TYPE_WEIGHTS = {
+    Link.LinkType.WEBSITE: 50,
+    Link.LinkType.ARTICLE: 25,
+    Link.LinkType.VIDEO: 10,
+    Link.LinkType.BOOK: 8,
+    Link.LinkType.MUSIC: 7,
+}
+
+FAILED_ENRICHMENT_RATE = 0.02
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset of users, links, collections and link collections. "
+        "Links per user follow a Pareto distribution, so a few users own most of the links "
+        "like in production. Meant for local databases and load tests (see load_test)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--links", type=float, default=50, help="Mean number of links per user.")
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.2,
+            help="Pareto shape of links per user; closer to 1 gives a longer tail (must be > 1).",
+        )
+        parser.add_argument("--max-links", type=int, default=50_000, help="Cap on links per user.")
+        parser.add_argument(
+            "--collections", type=float, default=5, help="Mean number of collections per user."
+        )
+        parser.add_argument(
+            "--membership-rate",
+            type=float,
+            default=0.3,
+            help="Share of links added to one of their user's collections.",
+        )
+        parser.add_argument("--password", default="password", help="Password of every generated user.")
+        parser.add_argument("--email-domain", default="example.com")
+        parser.add_argument(
+            "--days", type=int, default=365, help="Spread created_at over this many days."
+        )
+        parser.add_argument("--seed", type=int, help="Seed the random generator for a repeatable dataset.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per COPY or INSERT.")
+        parser.add_argument(
+            "--method", choices=["copy", "insert"], help="Defaults to copy on PostgreSQL."
+        )
+        parser.add_argument(
+            "--skip-stats", action="store_true", help="Do not rebuild LinkStats after loading."
+        )
+
+    def handle(
+        self,
+        *args,
+        users,
+        links,
+        skew,
+        max_links,
+        collections,
+        membership_rate,
+        password,
+        email_domain,
+        days,
+        seed,
+        batch_size,
+        method,
+        skip_stats,
+        **options,
+    ):
+        if skew <= 1:
+            raise CommandError("--skew must be greater than 1")
+        try:
+            loader = BulkLoader(batch_size=batch_size, method=method)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.random = random.Random(seed)
+        self.links = links
+        self.skew = skew
+        self.max_links = max_links
+        self.collections = collections
+        self.membership_rate = membership_rate
+        self.days = days
+        # Hashing is deliberately slow, so every user shares one hash.
+        self.password = make_password(password)
+        self.email_domain = email_domain
+        self.now = timezone.now()
+
+        started = time.perf_counter()
+        loader.load_objects(self.iter_objects(users))
+        elapsed = time.perf_counter() - started
+
+        for label, count in sorted(loader.counts.items()):
+            self.stdout.write(f"{label:<28} {count:>10} rows")
+        total = sum(loader.counts.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s) with {loader.method}"
+            )
+        )
+
+        if loader.counts.get("links.link") and not skip_stats:
+            call_command("rebuild_link_stats", stdout=self.stdout)
+
+    def next_ids(self) -> dict[type[Model], int]:
+        # New rows get explicit keys after the existing ones; the loader resets the sequences.
+        return {
+            model: (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+            for model in (UserAccount, Link, Collection, LinkCollection)
+        }
+
+    def link_count(self) -> int:
+        # Pareto with scale chosen so the mean is self.links: mean = skew * scale / (skew - 1)
+        scale = self.links * (self.skew - 1) / self.skew
+        return min(int(self.random.paretovariate(self.skew) * scale), self.max_links)
+
+    def timestamp(self, after: datetime | None = None) -> datetime:
+        if after is None:
+            return self.now - timedelta(seconds=self.random.uniform(0, self.days * 86400))
+        # Updates and child rows cluster shortly after the row they follow.
+        return after + (self.now - after) * self.random.random() ** 4
+
+    def words(self, count: int) -> str:
+        return " ".join(self.random.choices(WORDS, k=count))
+
+    def iter_objects(self, users: int) -> Iterator[Model]:
+        ids = self.next_ids()
+        link_types = list(LINK_TYPE_WEIGHTS)
+        link_type_weights = list(LINK_TYPE_WEIGHTS.values())
+
+        for _ in range(users):
+            user_id = ids[UserAccount]
+            ids[UserAccount] += 1
+            joined_at = self.timestamp()
+            yield UserAccount(
+                id=user_id,
+                email=f"user{user_id}@{self.email_domain}",
+                password=self.password,
+                created_at=joined_at,
+                updated_at=joined_at,
+            )
+
+            collection_ids = []
+            for _ in range(round(self.random.uniform(0, 2 * self.collections))):
+                created_at = self.timestamp(after=joined_at)
+                collection_ids.append(ids[Collection])
+                yield Collection(
+                    id=ids[Collection],
+                    user_id=user_id,
+                    name=self.words(self.random.randint(1, 3)).title(),
+                    description=self.words(self.random.randint(4, 16)),
+                    created_at=created_at,
+                    updated_at=self.timestamp(after=created_at),
+                )
+                ids[Collection] += 1
+
+            for number in range(self.link_count()):
+                link_id = ids[Link]
+                ids[Link] += 1
+                created_at = self.timestamp(after=joined_at)
+                host = self.random.choice(HOSTS)
+                slug = "-".join(self.random.choices(WORDS, k=3))
+                failed = self.random.random() < FAILED_ENRICHMENT_RATE
+                yield Link(
+                    id=link_id,
+                    user_id=user_id,
+                    # The number keeps the URL unique per user.
+                    link_url=f"https://{host}/{slug}-{number}",
+                    title=None if failed else self.words(self.random.randint(3, 10)).capitalize(),
+                    description=None if failed else self.words(self.random.randint(10, 40)),
+                    image=None if failed else f"https://{host}/images/{link_id}.jpg",
+                    link_type=self.random.choices(link_types, link_type_weights)[0],
+                    enrichment_status=(
+                        Link.EnrichmentStatus.FAILED if failed else Link.EnrichmentStatus.READY
+                    ),
+                    created_at=created_at,
+                    updated_at=self.timestamp(after=created_at),
+                )
+
+                if collection_ids and self.random.random() < self.membership_rate:
+                    yield LinkCollection(
+                        id=ids[LinkCollection],
+                        link_id=link_id,
+                        collection_id=self.random.choice(collection_ids),
+                    )
+                    ids[LinkCollection] += 1
@@ -0,0 +1,176 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.links.benchmarks.corpus import load_corpus
+from apps.links.benchmarks.load import LoadDriver
+from apps.links.benchmarks.server import CorpusServer
+from apps.links.models import Link
+from apps.users.models import UserAccount
+from core.cache import get_response_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every endpoint in core.urls (except the admin) with a scenario of reads and writes "
+        "as existing users, e.g. those made by generate_data, and report per-endpoint latency, "
+        "throughput and query counts. Links point at a local stub, so Open Graph fetches never "
+        "leave the machine. Writes are undone by the scenario; run it against a local database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Scenario runs to measure.")
+        parser.add_argument("--warmup", type=int, default=1, help="Scenario runs before measuring.")
+        parser.add_argument("--users", type=int, default=10, help="Number of random users to act as.")
+        parser.add_argument(
+            "--email", action="append", dest="emails", help="Act as this user (repeatable)."
+        )
+        parser.add_argument(
+            "--password", default="password", help="Password of the users (see generate_data)."
+        )
+        parser.add_argument("--seed", type=int, help="Seed the choice of random users.")
+        parser.add_argument("--json", dest="json_path", help="Write the results to this file.")
+        parser.add_argument(
+            "--baseline", help="Compare against the results file of an earlier run and fail on regressions."
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.25,
+            help="Allowed p50 and query count growth relative to the baseline (0.25 = 25%%).",
+        )
+
+    def handle(
+        self,
+        *args,
+        iterations,
+        warmup,
+        users,
+        emails,
+        password,
+        seed,
+        json_path,
+        baseline,
+        max_regression,
+        **options,
+    ):
+        accounts = self.get_users(users, emails, seed)
+        queries = [
+            title.split()[0]
+            for title in Link.objects.filter(user__in=accounts, title__gt="")
+            .values_list("title", flat=True)[:50]
+        ] or ["python"]
+
+        article = next(page for page in load_corpus() if page.name == "article")
+        with CorpusServer([article], fallback=article) as server:
+            driver = LoadDriver(users=accounts, password=password, url=server.url, queries=queries)
+            for _ in range(warmup):
+                driver.iterate(record=False)
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                driver.iterate()
+            elapsed = time.perf_counter() - started
+        driver.cleanup()
+
+        results = driver.results()
+        self.write_table(results)
+        total = sum(result["requests"] for result in results)
+        self.stdout.write(
+            f"\n{total} requests in {elapsed:.1f}s: {total / max(elapsed, 1e-9):.1f} requests/s overall, "
+            f"{total / max(driver.elapsed, 1e-9):.1f} requests/s inside the views; "
+            f"{server.requests} Open Graph fetches served by the stub"
+        )
+
+        cache_stats = get_response_cache().stats()
+        if cache_stats:
+            self.stdout.write("\nResponse cache:")
+            for endpoint, stats in cache_stats.items():
+                self.stdout.write(
+                    f"{endpoint:<24} {stats['hits']:>7} hits {stats['misses']:>7} misses "
+                    f"{stats['hit_ratio']:>7.1%}"
+                )
+
+        uncovered = driver.uncovered_routes()
+        if uncovered:
+            self.stdout.write(self.style.WARNING("\nRoutes without a load test step:"))
+            for route in uncovered:
+                self.stdout.write(self.style.WARNING(f"  {route}"))
+
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump(
+                    {
+                        "iterations": iterations,
+                        "users": [account.pk for account in accounts],
+                        "results": results,
+                        "response_cache": cache_stats,
+                    },
+                    f,
+                    indent=4,
+                )
+
+        errors = sum(result["errors"] for result in results)
+        if errors:
+            raise CommandError(f"{errors} requests answered with an unexpected status")
+
+        if baseline:
+            self.compare(results, baseline, max_regression)
+
+    def get_users(self, count: int, emails: list[str] | None, seed: int | None) -> list[UserAccount]:
+        if emails:
+            accounts = list(UserAccount.objects.filter(email__in=emails))
+            missing = set(emails) - {account.email for account in accounts}
+            if missing:
+                raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+            return accounts
+
+        ids = list(UserAccount.objects.filter(is_active=True).values_list("id", flat=True))
+        if not ids:
+            raise CommandError("No users to act as; run generate_data first")
+        sample = random.Random(seed).sample(ids, min(count, len(ids)))
+        return list(UserAccount.objects.filter(id__in=sample).order_by("id"))
+
+    def write_table(self, results: list[dict]) -> None:
+        header = (
+            f"{'endpoint':<24} {'requests':>8} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'req/s':>9} {'queries':>8} {'max q':>6}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for result in results:
+            self.stdout.write(
+                f"{result['endpoint']:<24} {result['requests']:>8} {result['errors']:>6} "
+                f"{result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+                f"{result['requests_per_second']:>9.1f} {result['mean_queries']:>8.1f} "
+                f"{result['max_queries']:>6}"
+            )
+            if result["errors"] or result["skipped"]:
+                statuses = ", ".join(f"{status}: {count}" for status, count in result["statuses"].items())
+                self.stdout.write(
+                    self.style.WARNING(f"{'':<24} statuses {statuses}; {result['skipped']} skipped")
+                )
+
+    def compare(self, results: list[dict], baseline_path: str, max_regression: float) -> None:
+        with open(baseline_path) as f:
+            baseline = {result["endpoint"]: result for result in json.load(f)["results"]}
+
+        regressions = []
+        for result in results:
+            previous = baseline.get(result["endpoint"])
+            if previous is None:
+                continue
+            if result["p50_ms"] > previous["p50_ms"] * (1 + max_regression):
+                regressions.append(
+                    f"{result['endpoint']}: p50 {previous['p50_ms']:.3f} ms -> {result['p50_ms']:.3f} ms"
+                )
+            if result["mean_queries"] > previous["mean_queries"] * (1 + max_regression):
+                regressions.append(
+                    f"{result['endpoint']}: queries {previous['mean_queries']:.1f} -> {result['mean_queries']:.1f}"
+                )
+
+        if regressions:
+            raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.links.services import link_stats_rebuild
+from apps.users.models import UserAccount
+
+
+class Command(BaseCommand):
+    help = "Recount every user's links and rewrite the LinkStats table, one batch of users at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        user_ids = UserAccount.objects.order_by("id").values_list("id", flat=True)
+
+        rebuilt = 0
+        last_id = 0
+        while True:
+            batch = list(user_ids.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            rebuilt += link_stats_rebuild(user_ids=batch)
+            last_id = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt link stats of {rebuilt} users"))
@@ -0,0 +1,7 @@
+from django.db import models
+
+
+class LinkQuerySet(models.QuerySet):
+    def for_user(self, user_id: int) -> "LinkQuerySet":
+        """Links owned by the user, filtered on the indexed user_id column without joining users."""
+        return self.filter(user_id=user_id)
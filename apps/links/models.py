@@ -1,7 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from apps.users.models import UserAccount
 
+from .managers import LinkQuerySet
+
 
 class Link(models.Model):
     class LinkType(models.TextChoices):
@@ -11,6 +15,11 @@ class Link(models.Model):
         MUSIC = "music", "Music"
         VIDEO = "video", "Video"
 
+    class EnrichmentStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
     link_url = models.URLField(max_length=255, null=True)
     title = models.CharField(max_length=255, null=True)
     description = models.TextField(null=True)
@@ -18,9 +27,18 @@ class Link(models.Model):
     link_type = models.CharField(
         max_length=50, choices=LinkType.choices, default=LinkType.WEBSITE
     )
+    enrichment_status = models.CharField(
+        max_length=20,
+        choices=EnrichmentStatus.choices,
+        default=EnrichmentStatus.READY,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(UserAccount, on_delete=models.CASCADE)
+    # Maintained by a database trigger, see apps.links.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = LinkQuerySet.as_manager()
 
     def __str__(self) -> str:
         return f"Link: {self.link_url}"
@@ -28,3 +46,50 @@ class Link(models.Model):
     class Meta:
         verbose_name = "link"
         verbose_name_plural = "links"
+        constraints = [
+            # Also serves every lookup that filters by user_id alone.
+            models.UniqueConstraint(fields=["user", "link_url"], name="link_user_link_url_uniq"),
+        ]
+        indexes = [
+            # link_list: WHERE user_id = %s ORDER BY created_at DESC, id DESC (and its keyset cursor).
+            models.Index(fields=["user", "-created_at", "-id"], name="link_user_created_idx"),
+            # Conditional requests: max(updated_at) WHERE user_id = %s.
+            models.Index(fields=["user", "updated_at"], name="link_user_updated_idx"),
+            # enrich_links: only the few links that still wait for a fetch are indexed.
+            models.Index(
+                fields=["id"],
+                name="link_enrichment_pending_idx",
+                condition=models.Q(enrichment_status="pending"),
+            ),
+            GinIndex(fields=["search_vector"], name="link_search_vector_idx"),
+        ]
+
+
+class LinkStats(models.Model):
+    """
+    Number of links of a user, in total and per link type.
+    Kept up to date in the same transaction as every link write (see apps.links.services)
+    and rebuilt with the rebuild_link_stats command.
+    """
+
+    user = models.OneToOneField(
+        UserAccount, on_delete=models.CASCADE, primary_key=True, related_name="link_stats"
+    )
+    total = models.IntegerField(default=0)
+    website = models.IntegerField(default=0)
+    book = models.IntegerField(default=0)
+    article = models.IntegerField(default=0)
+    music = models.IntegerField(default=0)
+    video = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"LinkStats: {self.user_id}"
+
+    class Meta:
+        verbose_name = "link stats"
+        verbose_name_plural = "link stats"
+        indexes = [
+            # link_stats_leaderboard: ORDER BY total DESC, user_id LIMIT n
+            models.Index(fields=["-total", "user"], name="link_stats_leaderboard_idx"),
+        ]
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import connections
+
+from apps.links.models import Link
+
+# Title matches rank above description matches, which rank above URL matches. URLs are indexed
+# with the "simple" configuration so host and path segments are not stemmed.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('{config}', coalesce({row}.title, '')), 'A') ||
+    setweight(to_tsvector('{config}', coalesce({row}.description, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce({row}.link_url, '')), 'C')
+"""
+
+TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {vector};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table};
+CREATE TRIGGER {table}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, link_url ON {table}
+    FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+"""
+
+BACKFILL_SQL = """
+UPDATE {table} SET search_vector = {vector}
+WHERE id IN (SELECT id FROM {table} WHERE search_vector IS NULL LIMIT %s)
+"""
+
+
+def _format(sql: str, row: str) -> str:
+    vector = SEARCH_VECTOR_SQL.format(config=settings.LINK_SEARCH_CONFIG, row=row)
+    return sql.format(table=Link._meta.db_table, vector=vector)
+
+
+def install_search_trigger(*, using: str = "default", **kwargs) -> None:
+    """
+    post_migrate handler that (re)creates the trigger keeping Link.search_vector up to date.
+    The project does not track migrations, so the trigger can not live in a RunSQL operation.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(_format(TRIGGER_SQL, row="NEW"))
+
+
+def backfill_search_vectors(*, batch_size: int, using: str = "default") -> int:
+    """
+    Compute the search vector of links saved before the trigger existed.
+    Works in batches so every UPDATE holds its row locks briefly.
+    Returns:
+        int: The number of links updated.
+    """
+    sql = _format(BACKFILL_SQL, row=Link._meta.db_table)
+    updated = 0
+    with connections[using].cursor() as cursor:
+        while True:
+            cursor.execute(sql, [batch_size])
+            if cursor.rowcount == 0:
+                return updated
+            updated += cursor.rowcount
@@ -1,4 +1,12 @@
-from apps.links.models import Link
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Count, DecimalField, F, Max
+from django.db.models.functions import Cast
+
+from apps.collection.models import LinkCollection
+from apps.links.models import Link, LinkStats
 from core.utils import get_object
 from core.exceptions import NotFoundError
 
@@ -15,9 +23,11 @@ def link_get(*, user_id: int, link_id: int) -> Link:
         NotFoundError: If the link is not found or if the link does not belong to the specified user.
     """
 
-    link = get_object(Link, id=link_id)
+    link = get_object(
+        Link.objects.for_user(user_id).select_related("user").defer("search_vector"), id=link_id
+    )
 
-    if link is None or link.user.id != user_id:
+    if link is None:
         raise NotFoundError
     return link
 
@@ -28,8 +38,149 @@ def link_list(user_id: int) -> list[Link]:
     Args:
         user_id (int): The ID of the user.
     Returns:
-        list[Link]: A list of Link objects filtered by the user ID.
+        list[Link]: A list of Link objects filtered by the user ID, newest first.
     """
 
-    link = Link.objects.filter(user__id=user_id)
+    link = (
+        Link.objects.for_user(user_id)
+        .select_related("user")
+        .defer("search_vector")
+        .order_by("-created_at", "-id")
+    )
     return link
+
+
+def link_search(
+    *,
+    user_id: int,
+    query: str,
+    link_type: str | None = None,
+    collection_id: int | None = None,
+) -> list[Link]:
+    """
+    Full-text search over the title, description and URL of a user's links.
+    Matching uses the GIN index on Link.search_vector; results are annotated with their rank.
+    Args:
+        user_id (int): The ID of the user.
+        query (str): The search terms, in web search syntax ("quoted phrases", -excluded, or).
+        link_type (str | None): Only return links of this type.
+        collection_id (int | None): Only return links in this collection.
+    Returns:
+        list[Link]: The matching links, best match first.
+    """
+    search_query = SearchQuery(query, config=settings.LINK_SEARCH_CONFIG, search_type="websearch")
+
+    links = (
+        Link.objects.for_user(user_id)
+        .filter(search_vector=search_query)
+        # ts_rank is a float4, which does not survive the round trip through a JSON cursor;
+        # as numeric the keyset comparison on (rank, id) is exact.
+        .annotate(
+            rank=Cast(
+                SearchRank(F("search_vector"), search_query),
+                output_field=DecimalField(max_digits=20, decimal_places=10),
+            )
+        )
+        .select_related("user")
+        .defer("search_vector")
+        .order_by("-rank", "-id")
+    )
+    if link_type is not None:
+        links = links.filter(link_type=link_type)
+    if collection_id is not None:
+        links = links.filter(linkcollection__collection_id=collection_id)
+    return links
+
+
+def link_stats_get(*, user_id: int) -> LinkStats:
+    """
+    Retrieve the link counts of a user.
+    Args:
+        user_id (int): The ID of the user.
+    Returns:
+        LinkStats: The user's counts; an unsaved all-zero row if the user has no links yet.
+    """
+    stats = LinkStats.objects.filter(user_id=user_id).first()
+    if stats is None:
+        return LinkStats(user_id=user_id)
+    return stats
+
+
+def link_count(*, user_id: int) -> int | None:
+    """
+    Retrieve the number of links of a user from LinkStats, without counting the links.
+    Args:
+        user_id (int): The ID of the user.
+    Returns:
+        int | None: The number of links, or None if the user's stats have not been built yet.
+    """
+    return LinkStats.objects.filter(user_id=user_id).values_list("total", flat=True).first()
+
+
+def link_stats_leaderboard(*, limit: int) -> list[LinkStats]:
+    """
+    Retrieve the users with the most links.
+    Args:
+        limit (int): The number of users to return.
+    Returns:
+        list[LinkStats]: The stats of the top users, most links first.
+    """
+    return list(LinkStats.objects.filter(total__gt=0).order_by("-total", "user_id")[:limit])
+
+
+def link_updated_at(*, user_id: int, link_id: int) -> datetime | None:
+    """
+    Retrieve when a link last changed, for conditional requests.
+    Args:
+        user_id (int): The ID of the user.
+        link_id (int): The ID of the link.
+    Returns:
+        datetime | None: The link's updated_at, or None if the user has no such link.
+    """
+    return (
+        Link.objects.for_user(user_id).filter(id=link_id).values_list("updated_at", flat=True).first()
+    )
+
+
+def link_list_state(*, user_id: int) -> tuple[datetime | None, int]:
+    """
+    Retrieve when the user's links last changed and how many there are, for conditional requests.
+    Reads the newest entry of the (user, updated_at) index and the user's LinkStats row,
+    whose updated_at also moves when a link is deleted.
+    Args:
+        user_id (int): The ID of the user.
+    Returns:
+        tuple[datetime | None, int]: The time of the last change and the number of links.
+    """
+    updated_at = Link.objects.for_user(user_id).aggregate(updated_at=Max("updated_at"))["updated_at"]
+    stats = LinkStats.objects.filter(user_id=user_id).values_list("updated_at", "total").first()
+    if stats is None:
+        return updated_at, Link.objects.for_user(user_id).count()
+
+    stats_updated_at, total = stats
+    return max(filter(None, (updated_at, stats_updated_at)), default=None), total
+
+
+def link_search_state(*, user_id: int, collection_id: int | None = None) -> tuple:
+    """
+    Retrieve the state of the user's links for conditional search requests. When the search is
+    limited to a collection, its results also change with the collection's memberships, which
+    have no timestamp; their number and newest ID are added, so adding or removing a link
+    changes the state.
+    Args:
+        user_id (int): The ID of the user.
+        collection_id (int | None): The collection the search is limited to, if any.
+    Returns:
+        tuple: The time of the last change and the number of links, followed by the number of
+            memberships and the newest membership ID when a collection is given.
+    """
+    state = link_list_state(user_id=user_id)
+    if collection_id is None:
+        return state
+
+    memberships = (
+        LinkCollection.objects.for_user(user_id)
+        .filter(collection_id=collection_id)
+        .aggregate(count=Count("id"), last_id=Max("id"))
+    )
+    return *state, memberships["count"], memberships["last_id"]
@@ -1,26 +1,60 @@
-from apps.links.models import Link
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from apps.links.models import Link, LinkStats
 from apps.users.models import UserAccount
-from core.exceptions import LinkExistsError, NotFoundError
-from core.utils import fetch_open_graph_data, get_object
+from core import background
+from core.cache import invalidate_user_responses
+from core.exceptions import (
+    HostUnavailableError,
+    LinkExistsError,
+    NotFoundError,
+    OpenGraphFetchError,
+)
+from core.utils import fetch_open_graph_data, update_object
 
 
 def link_create(*, user: UserAccount, link: str) -> Link:
     """
     Create a new Link object with the provided user and link URL.
+    When LINK_ENRICHMENT_ASYNC is enabled the link is saved as pending and
+    its Open Graph data is fetched on the background pool.
     Args:
         user (UserAccount): The user account associated with the link.
         link (str): The URL of the link.
     Returns:
         Link: The newly created Link object.
     Raises:
-        None
+        LinkExistsError: If the user already saved this URL.
+        OpenGraphFetchError: If the page can not be fetched (synchronous mode only).
     """
-    if Link.objects.filter(link_url=link, user=user).exists():
+    if settings.LINK_ENRICHMENT_ASYNC:
+        link_obj = _link_insert(
+            user=user,
+            link_url=link,
+            enrichment_status=Link.EnrichmentStatus.PENDING,
+        )
+        transaction.on_commit(
+            partial(background.submit, link_enrich, link_id=link_obj.id)
+        )
+        return link_obj
+
+    # Checked before the fetch so that saving a URL again costs no page download; the unique
+    # constraint still rejects a concurrent save of the same URL.
+    if Link.objects.for_user(user.id).filter(link_url=link).exists():
         raise LinkExistsError
 
     og_data = fetch_open_graph_data(link)
 
-    link_obj = Link.objects.create(
+    link_obj = _link_insert(
         user=user,
         link_url=link,
         title=og_data["title"],
@@ -28,9 +62,222 @@ def link_create(*, user: UserAccount, link: str) -> Link:
         image=og_data["image"],
         link_type=og_data["link_type"],
     )
+    return link_obj
 
-    link_obj.save()
-    return link
+
+def _link_insert(**fields) -> Link:
+    """
+    Insert a link, relying on the (user, link_url) unique constraint to reject duplicates.
+    The savepoint keeps an outer transaction usable after the IntegrityError.
+    """
+    try:
+        with transaction.atomic():
+            link_obj = Link.objects.create(**fields)
+            _link_stats_apply(user_id=link_obj.user_id, changes={link_obj.link_type: 1})
+            invalidate_user_responses(link_obj.user_id)
+            return link_obj
+    except IntegrityError:
+        raise LinkExistsError
+
+
+def _fetch_open_graph_data_for_import(url: str) -> tuple[dict | None, str]:
+    try:
+        return fetch_open_graph_data(url), Link.EnrichmentStatus.READY
+    except HostUnavailableError:
+        return None, Link.EnrichmentStatus.PENDING
+    except OpenGraphFetchError:
+        return None, Link.EnrichmentStatus.FAILED
+
+
+def link_bulk_create(*, user: UserAccount, links: list[str]) -> list[dict]:
+    """
+    Create many links at once, e.g. when importing bookmarks from another tool.
+    URLs the user already saved are skipped with a single query, Open Graph data is fetched
+    concurrently (or left to the background pool when LINK_ENRICHMENT_ASYNC is enabled)
+    and the rows are written with batched inserts.
+    Args:
+        user (UserAccount): The user account associated with the links.
+        links (list[str]): The URLs to save.
+    Returns:
+        list[dict]: One entry per input URL with its "url" and "status" ("created", "exists",
+            "duplicate" or "invalid"), plus "id" and "enrichment_status" for created links.
+            URLs another request saved while the import was running are reported as "exists".
+    """
+    validate_url = URLValidator()
+    max_length = Link._meta.get_field("link_url").max_length
+
+    report = []
+    seen = set()
+    for url in links:
+        url = url.strip()
+        entry = {"url": url, "status": "invalid"}
+        report.append(entry)
+
+        if url in seen:
+            entry["status"] = "duplicate"
+            continue
+        try:
+            validate_url(url)
+        except ValidationError:
+            continue
+        if len(url) > max_length:
+            continue
+
+        seen.add(url)
+        entry["status"] = "created"
+
+    existing = set(
+        Link.objects.for_user(user.id).filter(link_url__in=seen).values_list("link_url", flat=True)
+    )
+    new_entries = []
+    for entry in report:
+        if entry["status"] != "created":
+            continue
+        if entry["url"] in existing:
+            entry["status"] = "exists"
+        else:
+            new_entries.append(entry)
+
+    new_links = [Link(user=user, link_url=entry["url"]) for entry in new_entries]
+
+    if settings.LINK_ENRICHMENT_ASYNC:
+        for link_obj in new_links:
+            link_obj.enrichment_status = Link.EnrichmentStatus.PENDING
+    else:
+        with ThreadPoolExecutor(max_workers=settings.LINK_BULK_IMPORT_WORKERS) as executor:
+            results = executor.map(
+                _fetch_open_graph_data_for_import, [link_obj.link_url for link_obj in new_links]
+            )
+            for link_obj, (og_data, enrichment_status) in zip(new_links, results):
+                link_obj.enrichment_status = enrichment_status
+                if og_data is None:
+                    continue
+                link_obj.title = og_data["title"]
+                link_obj.description = og_data["description"]
+                link_obj.image = og_data["image"]
+                link_obj.link_type = og_data["link_type"]
+
+    while new_links:
+        try:
+            _link_bulk_insert(user_id=user.id, entries=new_entries, links=new_links)
+            break
+        except IntegrityError:
+            # A concurrent request saved some of the URLs after the existence check above.
+            # The savepoint rolled the batch back; drop those URLs and insert the rest.
+            existing = set(
+                Link.objects.for_user(user.id)
+                .filter(link_url__in=[link_obj.link_url for link_obj in new_links])
+                .values_list("link_url", flat=True)
+            )
+            if not existing:
+                raise
+            kept = []
+            for entry, link_obj in zip(new_entries, new_links):
+                if entry["url"] in existing:
+                    entry["status"] = "exists"
+                else:
+                    # Earlier batches got keys that were rolled back with them.
+                    link_obj.pk = None
+                    kept.append((entry, link_obj))
+            new_entries = [entry for entry, _ in kept]
+            new_links = [link_obj for _, link_obj in kept]
+
+    return report
+
+
+def _link_bulk_insert(*, user_id: int, entries: list[dict], links: list[Link]) -> None:
+    """
+    Insert the links of a bulk import and fill in their report entries.
+    The savepoint keeps an outer transaction usable after the IntegrityError.
+    """
+    with transaction.atomic():
+        Link.objects.bulk_create(links, batch_size=settings.LINK_BULK_IMPORT_BATCH_SIZE)
+        changes = {}
+        for link_obj in links:
+            changes[link_obj.link_type] = changes.get(link_obj.link_type, 0) + 1
+        _link_stats_apply(user_id=user_id, changes=changes)
+        invalidate_user_responses(user_id)
+
+        for entry, link_obj in zip(entries, links):
+            entry["id"] = link_obj.id
+            entry["enrichment_status"] = link_obj.enrichment_status
+            if link_obj.enrichment_status == Link.EnrichmentStatus.PENDING:
+                transaction.on_commit(
+                    partial(background.submit, link_enrich, link_id=link_obj.id)
+                )
+
+
+def link_enrich(*, link_id: int, attempt: int = 1) -> None:
+    """
+    Fetch Open Graph data for a pending link and fill in the fields the user has not set.
+    If the link's host is unavailable the link stays pending and the fetch is retried
+    once the host's circuit breaker may have closed, up to OPEN_GRAPH_ENRICH_MAX_ATTEMPTS
+    attempts; after that the link is marked failed.
+    Args:
+        link_id (int): The ID of the link to enrich.
+        attempt (int): The number of this attempt, starting at 1.
+    Returns:
+        None
+    """
+    link = (
+        Link.objects.filter(id=link_id, enrichment_status=Link.EnrichmentStatus.PENDING)
+        .only("id", "user_id", "link_url")
+        .first()
+    )
+    if link is None:
+        return
+
+    try:
+        og_data = fetch_open_graph_data(link.link_url)
+    except OpenGraphFetchError as e:
+        if (
+            isinstance(e, HostUnavailableError)
+            and attempt < settings.OPEN_GRAPH_ENRICH_MAX_ATTEMPTS
+        ):
+            background.submit_later(
+                settings.OPEN_GRAPH_BREAKER_RESET_TIMEOUT,
+                link_enrich,
+                link_id=link_id,
+                attempt=attempt + 1,
+            )
+            return
+        # A concurrent attempt may have finished the link since it was read.
+        if Link.objects.filter(id=link_id, enrichment_status=Link.EnrichmentStatus.PENDING).update(
+            enrichment_status=Link.EnrichmentStatus.FAILED,
+            updated_at=timezone.now(),
+        ):
+            invalidate_user_responses(link.user_id)
+        return
+
+    with transaction.atomic():
+        link = (
+            Link.objects.select_for_update()
+            .filter(id=link_id, enrichment_status=Link.EnrichmentStatus.PENDING)
+            .only("id", "user_id", "title", "description", "image", "link_type")
+            .first()
+        )
+        if link is None:
+            return
+
+        # Only fill in what the user has not set while the link was pending; a link type other
+        # than the default it was saved with was chosen by the user.
+        fields = {
+            name: og_data[name]
+            for name in ("title", "description", "image")
+            if getattr(link, name) is None
+        }
+        if link.link_type == Link.LinkType.WEBSITE:
+            fields["link_type"] = og_data["link_type"]
+
+        Link.objects.filter(id=link_id).update(
+            **fields,
+            enrichment_status=Link.EnrichmentStatus.READY,
+            updated_at=timezone.now(),
+        )
+        link_type = fields.get("link_type", link.link_type)
+        if link_type != link.link_type:
+            _link_stats_apply(user_id=link.user_id, changes={link.link_type: -1, link_type: 1})
+        invalidate_user_responses(link.user_id)
 
 
 def link_delete(*, user_id: int, link_id: int) -> None:
@@ -45,52 +292,126 @@ def link_delete(*, user_id: int, link_id: int) -> None:
         None
     """
 
-    link: Link = get_object(Link, id=link_id)
+    with transaction.atomic():
+        link = (
+            Link.objects.for_user(user_id)
+            .select_for_update()
+            .filter(id=link_id)
+            .only("id", "link_type")
+            .first()
+        )
+        if link is None:
+            raise NotFoundError
 
-    if link is None or link.user.id != user_id:
-        raise NotFoundError
-    link.delete()
+        # Deleting the locked instance cascades without selecting the row again.
+        link.delete()
+        _link_stats_apply(user_id=user_id, changes={link.link_type: -1})
+        invalidate_user_responses(user_id)
 
 
 def link_update(
     *,
     user_id: int,
-    link_id: str,
-    link_url: str,
-    title: str,
-    description: str,
-    link_type: str,
-    image: str,
+    link_id: int,
+    expected_updated_at: datetime | None = None,
+    **fields,
 ) -> Link:
     """
     Update a link with the specified details.
+    Only the columns whose value changes are written, with a single-row UPDATE.
     Args:
         user_id (int): The ID of the user who owns the link.
-        link_id (str): The ID of the link to be updated.
-        link_url (str): The updated URL of the link.
-        title (str): The updated title of the link.
-        description (str): The updated description of the link.
-        link_type (str): The updated type of the link.
-        image (str): The updated image of the link.
+        link_id (int): The ID of the link to be updated.
+        expected_updated_at (datetime | None): The updated_at the client last saw (If-Match).
+        **fields: The new values, among link_url, title, description, link_type and image.
     Returns:
         Link: The updated link object.
     Raises:
         NotFoundError: If the link does not exist or does not belong to the specified user.
+        LinkExistsError: If the user already saved the new URL.
+        PreconditionFailedError: If the link changed since expected_updated_at.
+    """
+    try:
+        with transaction.atomic():
+            link, previous = update_object(
+                Link.objects.for_user(user_id).filter(id=link_id),
+                fields=fields,
+                expected_updated_at=expected_updated_at,
+            )
+            if "link_type" in previous:
+                _link_stats_apply(
+                    user_id=user_id, changes={previous["link_type"]: -1, link.link_type: 1}
+                )
+            if previous:
+                invalidate_user_responses(user_id)
+    except IntegrityError:
+        raise LinkExistsError
+    return link
+
+
+def _link_stats_apply(*, user_id: int, changes: dict[str, int]) -> None:
     """
+    Add per-link-type deltas to the user's LinkStats row, creating the row if needed.
+    Must run in the transaction that writes the links so the counts never drift.
+    """
+    counts = {link_type: delta for link_type, delta in changes.items() if delta}
+    if not counts:
+        return
 
-    link: Link = get_object(Link, id=link_id)
+    fields = {link_type: F(link_type) + delta for link_type, delta in counts.items()}
+    fields["total"] = F("total") + sum(counts.values())
+    fields["updated_at"] = timezone.now()
 
-    if link is None or link.user.id != user_id:
-        raise NotFoundError
-    
-    if link.link_url == link_url:
-        raise LinkExistsError
+    if not LinkStats.objects.filter(user_id=user_id).update(**fields):
+        LinkStats.objects.bulk_create([LinkStats(user_id=user_id)], ignore_conflicts=True)
+        LinkStats.objects.filter(user_id=user_id).update(**fields)
 
-    link_obj = Link.objects.update(
-        link_url=link_url,
-        title=title,
-        description=description,
-        image=image,
-        link_type=link_type,
-    )
-    return link_obj
+
+def link_stats_rebuild(*, user_ids: list[int]) -> int:
+    """
+    Recount the links of the given users and overwrite their LinkStats rows.
+    The stats rows are locked before counting, so link writes that commit during the rebuild
+    are either included in the count or applied on top of it afterwards.
+    Args:
+        user_ids (list[int]): The IDs of the users to rebuild.
+    Returns:
+        int: The number of rows written.
+    """
+    with transaction.atomic():
+        LinkStats.objects.bulk_create(
+            [LinkStats(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+        )
+        list(LinkStats.objects.select_for_update().filter(user_id__in=user_ids).values_list("pk"))
+
+        counts = {
+            row["user_id"]: row
+            for row in Link.objects.filter(user_id__in=user_ids)
+            .values("user_id")
+            .annotate(
+                total=Count("id"),
+                **{
+                    link_type: Count("id", filter=Q(link_type=link_type))
+                    for link_type in Link.LinkType.values
+                },
+            )
+        }
+
+        now = timezone.now()
+        stats = [
+            LinkStats(
+                user_id=user_id,
+                updated_at=now,
+                **{
+                    field: counts.get(user_id, {}).get(field, 0)
+                    for field in ("total", *Link.LinkType.values)
+                },
+            )
+            for user_id in user_ids
+        ]
+        LinkStats.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["total", *Link.LinkType.values, "updated_at"],
+        )
+    return len(stats)
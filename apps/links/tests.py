@@ -0,0 +1,591 @@
+import base64
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.core import checks
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from apps.collection.models import Collection, LinkCollection
+from apps.collection.services import link_collection_create
+from apps.links import services
+from apps.links.exporters import EXPORT_FIELDS
+from apps.links.models import Link, LinkStats
+from apps.links.services import (
+    link_bulk_create,
+    link_create,
+    link_enrich,
+    link_stats_rebuild,
+    link_update,
+)
+from apps.users.models import UserAccount
+from core.cache import check_response_cache
+from core.exceptions import LinkExistsError, OpenGraphFetchError
+from core.jsonstream import iter_json_array
+from core.renderers import ORJSONRenderer
+from core.utils import LimitOffsetPagination
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class LinkReadQueriesTests(APITestCase):
+    """Query counts of the link read endpoints; they must not grow with the number of rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.other = UserAccount.objects.create_user(email="other@example.com", password="password")
+        Link.objects.bulk_create(
+            Link(user=user, link_url=f"https://example.com/{user.pk}/{number}", title=f"Link {number}")
+            for user in (cls.user, cls.other)
+            for number in range(25)
+        )
+        link_stats_rebuild(user_ids=[cls.user.pk, cls.other.pk])
+        cls.link = Link.objects.filter(user=cls.user).first()
+        cls.other_link = Link.objects.filter(user=cls.other).first()
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_get_link(self):
+        # updated_at for the ETag, then the link joined with its user.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("get-link", kwargs={"link_id": self.link.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+
+    def test_get_link_of_other_user(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("get-link", kwargs={"link_id": self.other_link.pk}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_links(self):
+        # Max updated_at and LinkStats for the ETag, the count from LinkStats, then the page.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("list-link"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertTrue(all(row["user"]["id"] == self.user.pk for row in response.data["results"]))
+
+    def test_list_links_queries_do_not_grow_with_page_size(self):
+        for limit in (2, 20):
+            with self.subTest(limit=limit), self.assertNumQueries(4):
+                response = self.client.get(reverse("list-link"), {"limit": limit})
+            self.assertEqual(len(response.data["results"]), limit)
+
+        # Keyset pages skip the count.
+        for limit in (2, 20):
+            with self.subTest(limit=limit, cursor=True), self.assertNumQueries(3):
+                response = self.client.get(reverse("list-link"), {"limit": limit, "cursor": ""})
+            self.assertEqual(len(response.data["results"]), limit)
+
+
+class LinkWriteQueriesTests(APITestCase):
+    """Query counts of the link write endpoints; another user's link is answered with 404."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="writer@example.com", password="password")
+        cls.other = UserAccount.objects.create_user(email="other@example.com", password="password")
+        cls.link = Link.objects.create(user=cls.user, link_url="https://example.com/mine")
+        cls.other_link = Link.objects.create(user=cls.other, link_url="https://example.com/theirs")
+        link_stats_rebuild(user_ids=[cls.user.pk, cls.other.pk])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    # Counts include the SAVEPOINT and RELEASE (or ROLLBACK TO) around the services' atomic();
+    # outside of tests that is the request's own transaction.
+
+    def test_create_link(self):
+        # The insert and the LinkStats update; the fetch runs on the background pool.
+        with self.assertNumQueries(4):
+            response = self.client.post(reverse("create-link"), {"link": "https://example.com/new"})
+        self.assertEqual(response.status_code, 202)
+
+    def test_update_link(self):
+        # The scoped read of the changed columns, then the conditional UPDATE.
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                reverse("update-link", kwargs={"link_id": self.link.pk}), {"title": "Mine"}
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_link_of_other_user(self):
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                reverse("update-link", kwargs={"link_id": self.other_link.pk}), {"title": "Mine"}
+            )
+        self.assertEqual(response.status_code, 404)
+        self.other_link.refresh_from_db()
+        self.assertIsNone(self.other_link.title)
+
+    def test_delete_link(self):
+        # The scoped row lock, the cascade to memberships, the link and the LinkStats update.
+        with self.assertNumQueries(6):
+            response = self.client.delete(reverse("delete-link", kwargs={"link_id": self.link.pk}))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Link.objects.filter(pk=self.link.pk).exists())
+
+    def test_delete_link_of_other_user(self):
+        with self.assertNumQueries(4):
+            response = self.client.delete(
+                reverse("delete-link", kwargs={"link_id": self.other_link.pk})
+            )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Link.objects.filter(pk=self.other_link.pk).exists())
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class LinkConditionalRequestTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.link = Link.objects.create(user=cls.user, link_url="https://example.com/", title="Before")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_link_is_answered_with_304(self):
+        url = reverse("get-link", kwargs={"link_id": self.link.pk})
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_unchanged_list_is_answered_with_304_until_a_write(self):
+        etag = self.client.get(reverse("list-link"))["ETag"]
+        self.assertEqual(
+            self.client.get(reverse("list-link"), HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        self.client.patch(reverse("update-link", kwargs={"link_id": self.link.pk}), {"title": "After"})
+        response = self.client.get(reverse("list-link"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_update_with_stale_if_match_is_rejected(self):
+        url = reverse("update-link", kwargs={"link_id": self.link.pk})
+        etag = self.client.get(reverse("get-link", kwargs={"link_id": self.link.pk}))["ETag"]
+
+        response = self.client.patch(url, {"title": "First"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # The second writer still holds the old ETag.
+        response = self.client.patch(url, {"title": "Second"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.title, "First")
+
+    def test_update_with_invalid_if_match_is_rejected(self):
+        response = self.client.patch(
+            reverse("update-link", kwargs={"link_id": self.link.pk}),
+            {"title": "After"},
+            HTTP_IF_MATCH='"garbage"',
+        )
+        self.assertEqual(response.status_code, 412)
+
+class LinkCursorTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_invalid_cursor_is_rejected(self):
+        for position in (
+            ["garbage", 1],
+            ["2026-01-01T00:00:00Z", "abc"],
+            [None, None],
+            [1, 2],
+            ["2026-01-01T00:00:00Z"],
+            {"id": 1},
+        ):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            with self.subTest(position=position):
+                response = self.client.get(reverse("list-link"), {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class LinkSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        # Same words, so every link gets the same rank and pages are decided by the id.
+        Link.objects.bulk_create(
+            Link(user=cls.user, link_url=f"https://example.com/{number}", title="Python design patterns")
+            for number in range(40)
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_following_next_returns_every_match_once(self):
+        ids = []
+        url = reverse("search-link") + "?q=python&limit=3"
+        for _ in range(20):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+            if url is None:
+                break
+        self.assertIsNone(url)
+        self.assertEqual(sorted(ids), sorted(Link.objects.filter(user=self.user).values_list("id", flat=True)))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class LinkLeaderboardTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.other = UserAccount.objects.create_user(email="other@example.com", password="password")
+        Link.objects.bulk_create(
+            Link(user=user, link_url=f"https://example.com/{user.pk}/{number}")
+            for user, count in ((cls.user, 2), (cls.other, 3))
+            for number in range(count)
+        )
+        link_stats_rebuild(user_ids=[cls.user.pk, cls.other.pk])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_leaderboard_does_not_identify_users(self):
+        response = self.client.get(reverse("leaderboard-link"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(row["rank"], row["total"]) for row in response.data], [(1, 3), (2, 2)])
+        self.assertNotIn("user", response.data[0])
+        self.assertNotIn(b"other@example.com", response.content)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class LinkSearchConditionTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.links = Link.objects.bulk_create(
+            Link(user=cls.user, link_url=f"https://example.com/{number}", title="Python design patterns")
+            for number in range(2)
+        )
+        cls.collection = Collection.objects.create(user=cls.user, name="Reading", description="Later")
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_adding_a_link_to_the_collection_changes_the_etag(self):
+        params = {"q": "python", "collection": self.collection.pk}
+        response = self.client.get(reverse("search-link"), params)
+        self.assertEqual(response.data["results"], [])
+
+        link_collection_create(
+            user_id=self.user.pk, link_id=self.links[0].pk, collection_id=self.collection.pk
+        )
+        response = self.client.get(
+            reverse("search-link"), params, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.links[0].pk])
+
+    def test_invalid_collection_is_rejected(self):
+        response = self.client.get(reverse("search-link"), {"q": "python", "collection": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+
+class LinkResponseCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.link = Link.objects.create(user=cls.user, link_url="https://example.com/", title="Before")
+
+    def setUp(self):
+        # A file cache stands in for the shared backend the response cache requires.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_settings = self.settings(
+            RESPONSE_CACHE_ENABLED=True,
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory.name,
+                }
+            },
+        )
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+        self.client.force_authenticate(self.user)
+
+    def test_hit_keeps_the_etag(self):
+        for name, kwargs in (("list-link", {}), ("get-link", {"link_id": self.link.pk})):
+            with self.subTest(name=name):
+                miss = self.client.get(reverse(name, kwargs=kwargs))
+                hit = self.client.get(reverse(name, kwargs=kwargs))
+                self.assertEqual((miss["X-Cache"], hit["X-Cache"]), ("MISS", "HIT"))
+                self.assertEqual(hit["ETag"], miss["ETag"])
+                self.assertEqual(hit.data, miss.data)
+
+    def test_write_invalidates_cached_responses(self):
+        url = reverse("get-link", kwargs={"link_id": self.link.pk})
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("update-link", kwargs={"link_id": self.link.pk}), {"title": "After"}
+            )
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["title"], "After")
+
+    def test_check_refuses_per_process_backends(self):
+        self.assertEqual(check_response_cache(), [])
+        with self.settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        ):
+            errors = check_response_cache()
+        self.assertEqual([error.id for error in errors], ["core.E001"])
+        self.assertEqual(errors[0].level, checks.ERROR)
+
+
+@override_settings(LINK_ENRICHMENT_ASYNC=False)
+class LinkCreateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        Link.objects.create(user=cls.user, link_url="https://example.com/")
+
+    def test_saving_a_url_again_does_not_fetch_it(self):
+        with mock.patch("apps.links.services.fetch_open_graph_data") as fetch:
+            with self.assertRaises(LinkExistsError):
+                link_create(user=self.user, link="https://example.com/")
+        fetch.assert_not_called()
+
+
+@override_settings(LINK_BULK_IMPORT_BATCH_SIZE=1)
+class LinkBulkCreateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+
+    def test_urls_saved_concurrently_are_reported_as_existing(self):
+        urls = [f"https://example.com/{number}" for number in range(3)]
+        insert = services._link_bulk_insert
+
+        def save_concurrently(**kwargs):
+            # Another request saves the last URL between the existence check and the insert.
+            if not Link.objects.filter(link_url=urls[-1]).exists():
+                Link.objects.create(user=self.user, link_url=urls[-1])
+            return insert(**kwargs)
+
+        with mock.patch("apps.links.services._link_bulk_insert", side_effect=save_concurrently):
+            report = link_bulk_create(user=self.user, links=urls)
+
+        self.assertEqual([entry["status"] for entry in report], ["created", "created", "exists"])
+        self.assertEqual(
+            {entry["id"]: entry["url"] for entry in report[:2]},
+            dict(Link.objects.filter(link_url__in=urls[:2]).values_list("id", "link_url")),
+        )
+        self.assertEqual(LinkStats.objects.get(user=self.user).total, 2)
+
+
+@override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=10)
+class PaginationCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        Link.objects.bulk_create(
+            Link(user=cls.user, link_url=f"https://example.com/{number}") for number in range(3)
+        )
+
+    def paginate(self, queryset, estimate):
+        pagination = LimitOffsetPagination()
+        with mock.patch("core.utils.estimate_count", return_value=estimate) as estimate_count:
+            pagination.paginate_queryset(queryset, Request(APIRequestFactory().get("/")))
+        return pagination.count, estimate_count.called
+
+    def test_unfiltered_querysets_use_estimates_above_the_threshold(self):
+        self.assertEqual(self.paginate(Link.objects.order_by("id"), estimate=1000), (1000, True))
+        self.assertEqual(self.paginate(Link.objects.order_by("id"), estimate=5), (3, True))
+
+    def test_filtered_querysets_are_counted(self):
+        queryset = Link.objects.for_user(self.user.pk).order_by("id")
+        self.assertEqual(self.paginate(queryset, estimate=1000), (3, False))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            "title": "Line\u2028separator and paragraph\u2029separator, caf\u00e9 \U0001f600",
+            "rank": Decimal("0.0607927100"),
+            "ranks": [Decimal("1"), Decimal("-2.5"), 0.1, 3],
+            "created_at": datetime(2026, 10, 17, 12, 30, 5, 123456, tzinfo=timezone.utc),
+            "day": date(2026, 10, 17),
+            "duration": timedelta(minutes=1, microseconds=5),
+            "lazy": gettext_lazy("Not found."),
+            "nested": [{"id": 1, "image": None, "ok": True}],
+            "empty": [],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+@override_settings(LINK_EXPORT_CHUNK_SIZE=2)
+class LinkExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.other = UserAccount.objects.create_user(email="other@example.com", password="password")
+        cls.links = [
+            Link.objects.create(
+                user=cls.user,
+                link_url="https://example.com/a?x=1&y=2",
+                title='Say "hi", <b>&</b>',
+                description="First line\nsecond line",
+            ),
+            Link.objects.create(user=cls.user, link_url="https://example.com/b"),
+            Link.objects.create(user=cls.user, link_url="https://example.com/c", title="C"),
+        ]
+        Link.objects.create(user=cls.other, link_url="https://example.com/theirs")
+        for name in ("Work", "Reading"):
+            collection = Collection.objects.create(user=cls.user, name=name, description=name)
+            LinkCollection.objects.create(link=cls.links[0], collection=collection)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def export(self, file_format):
+        response = self.client.get(reverse("export-link"), {"file_format": file_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Disposition"], f'attachment; filename="links.{file_format}"'
+        )
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response, body = self.export("ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["id"] for row in rows], [link.pk for link in self.links])
+        self.assertEqual(set(rows[0]), {*EXPORT_FIELDS, "collections"})
+        self.assertEqual(rows[0]["title"], 'Say "hi", <b>&</b>')
+        self.assertEqual(rows[0]["description"], "First line\nsecond line")
+        self.assertEqual([row["collections"] for row in rows], [["Reading", "Work"], [], []])
+
+    def test_csv(self):
+        response, body = self.export("csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        header, *rows = csv.reader(io.StringIO(body, newline=""))
+        self.assertEqual(header, [*EXPORT_FIELDS, "collections"])
+        self.assertEqual([int(row[0]) for row in rows], [link.pk for link in self.links])
+        self.assertEqual(rows[0][2:4], ['Say "hi", <b>&</b>', "First line\nsecond line"])
+        self.assertEqual([row[-1] for row in rows], ["Reading;Work", "", ""])
+
+    def test_bookmarks_html(self):
+        response, body = self.export("html")
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertTrue(body.startswith("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"))
+        self.assertTrue(body.endswith("</DL><p>\n"))
+        self.assertEqual(body.count("<DT><A "), 3)
+        self.assertIn('HREF="https://example.com/a?x=1&amp;y=2"', body)
+        self.assertIn('TAGS="Reading,Work">Say &quot;hi&quot;, &lt;b&gt;&amp;&lt;/b&gt;</A>', body)
+        self.assertIn("<DD>First line\nsecond line\n", body)
+        # Links without a title show their URL.
+        self.assertIn(">https://example.com/b</A>", body)
+        self.assertNotIn("theirs", body)
+
+
+class JSONStreamTests(SimpleTestCase):
+    def test_items_split_at_every_chunk_boundary(self):
+        for text in (
+            '["ab", 2.5e3]',
+            '[1, -2.5E-3, 10e+2, 0, -0.0, 123456789, true, false, null]',
+            ' [ {"a": [1, "]", {"b": "x,y"}]}, "\\u00e9\\"", [] ] ',
+            "[]",
+        ):
+            for chunk_size in range(1, len(text) + 1):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    items = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+                    self.assertEqual(items, json.loads(text))
+
+    def test_invalid_files_are_rejected(self):
+        for text in ("", '{"a": 1}', "[1, 2", "[1 2.]", '["ab"'):
+            for chunk_size in (1, 3, 64):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError):
+                        list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+class LinkEnrichTests(APITestCase):
+    og_data = {
+        "title": "Fetched title",
+        "description": "Fetched description",
+        "image": "https://example.com/image.png",
+        "link_type": Link.LinkType.ARTICLE,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(email="reader@example.com", password="password")
+        cls.link = Link.objects.create(
+            user=cls.user,
+            link_url="https://example.com/",
+            enrichment_status=Link.EnrichmentStatus.PENDING,
+        )
+        link_stats_rebuild(user_ids=[cls.user.pk])
+
+    def test_fills_only_fields_the_user_has_not_set(self):
+        link_update(
+            user_id=self.user.pk, link_id=self.link.pk, title="Mine", link_type=Link.LinkType.BOOK
+        )
+        with mock.patch("apps.links.services.fetch_open_graph_data", return_value=self.og_data):
+            link_enrich(link_id=self.link.pk)
+
+        self.link.refresh_from_db()
+        self.assertEqual(
+            (self.link.title, self.link.description, self.link.link_type, self.link.enrichment_status),
+            ("Mine", "Fetched description", Link.LinkType.BOOK, Link.EnrichmentStatus.READY),
+        )
+        stats = LinkStats.objects.get(user=self.user)
+        self.assertEqual((stats.book, stats.article, stats.total), (1, 0, 1))
+
+    def test_fills_the_default_link_type(self):
+        with mock.patch("apps.links.services.fetch_open_graph_data", return_value=self.og_data):
+            link_enrich(link_id=self.link.pk)
+
+        self.link.refresh_from_db()
+        self.assertEqual(
+            (self.link.title, self.link.link_type), ("Fetched title", Link.LinkType.ARTICLE)
+        )
+        stats = LinkStats.objects.get(user=self.user)
+        self.assertEqual((stats.website, stats.article, stats.total), (0, 1, 1))
+
+    def test_failure_does_not_undo_a_finished_attempt(self):
+        def finish_concurrently(url):
+            Link.objects.filter(id=self.link.pk).update(enrichment_status=Link.EnrichmentStatus.READY)
+            raise OpenGraphFetchError("Not found")
+
+        with mock.patch("apps.links.services.fetch_open_graph_data", side_effect=finish_concurrently):
+            link_enrich(link_id=self.link.pk)
+
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.enrichment_status, Link.EnrichmentStatus.READY)
+
+    def test_same_link_type_keeps_the_counts(self):
+        og_data = {**self.og_data, "link_type": Link.LinkType.WEBSITE}
+        with mock.patch("apps.links.services.fetch_open_graph_data", return_value=og_data):
+            link_enrich(link_id=self.link.pk)
+
+        stats = LinkStats.objects.get(user=self.user)
+        self.assertEqual((stats.website, stats.total), (1, 1))
+
@@ -27,7 +27,7 @@ class UserAccount(AbstractBaseUser, PermissionsMixin):
 
 class PasswordReset(models.Model):
     user_id = models.IntegerField()
-    token = models.CharField(max_length=255)
+    token = models.CharField(max_length=255, unique=True)
     reset_url = models.URLField(max_length=255)
     created_at = models.DateTimeField(default=timezone.now)
     expriry_at = models.DateTimeField(
@@ -0,0 +1,66 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide thread pool used for background jobs.
+    The pool is created lazily so management commands and migrations never spawn threads.
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BACKGROUND_WORKERS,
+                    thread_name_prefix="background",
+                )
+    return _executor
+
+
+def _run(func: Callable, kwargs: dict) -> Any:
+    close_old_connections()
+    try:
+        return func(**kwargs)
+    except Exception:
+        logger.exception("Background job %s failed", func.__name__)
+        raise
+    finally:
+        close_old_connections()
+
+
+def submit(func: Callable, **kwargs) -> Future:
+    """
+    Run a function on the background pool.
+    Args:
+        func (Callable): The function to run. It receives ``kwargs`` as keyword arguments.
+    Returns:
+        Future: The future of the scheduled job.
+    """
+    return get_executor().submit(_run, func, kwargs)
+
+
+def submit_later(delay: float, func: Callable, **kwargs) -> threading.Timer:
+    """
+    Run a function on the background pool after a delay.
+    Args:
+        delay (float): The number of seconds to wait.
+        func (Callable): The function to run. It receives ``kwargs`` as keyword arguments.
+    Returns:
+        threading.Timer: The timer, which can be cancelled before it fires.
+    """
+    timer = threading.Timer(delay, submit, args=(func,), kwargs=kwargs)
+    timer.daemon = True
+    timer.start()
+    return timer
@@ -0,0 +1,148 @@
+import io
+from datetime import date, datetime
+from typing import Any, Iterable, TextIO
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Model
+
+from core.jsonstream import iter_json_array
+
+# Models the loader writes; other fixture entries (permissions, sessions, ...) are skipped.
+LOADABLE_MODELS = (
+    "users.useraccount",
+    "links.link",
+    "collection.collection",
+    "collection.linkcollection",
+)
+
+
+def _copy_text(value: Any) -> str:
+    """Formats a database value for the text format of COPY."""
+    if value is None:
+        return r"\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class BulkLoader:
+    """
+    Loads dumpdata-style JSON fixtures with batched writes instead of one save() per object.
+    The file is parsed incrementally and each model keeps a buffer of at most batch_size rows,
+    so memory does not grow with the size of the file. Rows are written with PostgreSQL COPY
+    or with multi-row INSERTs (raw, like loaddata, so fixture timestamps are kept).
+    Everything runs in one transaction with constraint checks deferred, so objects may
+    reference rows that appear later in the file; sequences are reset at the end.
+    Attributes:
+        counts (dict[str, int]): The number of rows written per model label.
+        skipped (dict[str, int]): The number of fixture entries skipped per model label.
+    """
+
+    def __init__(
+        self, *, using: str = "default", batch_size: int = 5000, method: str | None = None
+    ) -> None:
+        self.using = using
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        if method is None:
+            method = "copy" if self.connection.vendor == "postgresql" else "insert"
+        if method == "copy" and self.connection.vendor != "postgresql":
+            raise ValueError("COPY is only available on PostgreSQL")
+        self.method = method
+        self.counts: dict[str, int] = {}
+        self.skipped: dict[str, int] = {}
+        self._buffers: dict[type[Model], list[Model]] = {}
+
+    def load(self, files: Iterable[TextIO]) -> None:
+        entries = (entry for f in files for entry in iter_json_array(f) if self.accept(entry))
+        # Django's fixture deserializer converts the field values; it consumes the entries
+        # lazily. m2m data (user groups and permissions) is dropped.
+        self.load_objects(
+            deserialized.object
+            for deserialized in serializers.deserialize("python", entries, using=self.using)
+        )
+
+    def load_objects(self, objs: Iterable[Model]) -> None:
+        """Writes unsaved model instances, with their primary keys already set."""
+        with transaction.atomic(using=self.using), self.connection.constraint_checks_disabled():
+            for obj in objs:
+                self.add(obj)
+            self.flush()
+
+            models = list(self._buffers)
+            self.connection.check_constraints(table_names=[model._meta.db_table for model in models])
+            with self.connection.cursor() as cursor:
+                for sql in self.connection.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
+
+    def accept(self, entry: dict) -> bool:
+        label = entry.get("model", "").lower()
+        if label in LOADABLE_MODELS:
+            return True
+        self.skipped[label] = self.skipped.get(label, 0) + 1
+        return False
+
+    def add(self, obj: Model) -> None:
+        buffer = self._buffers.setdefault(type(obj), [])
+        buffer.append(obj)
+        if len(buffer) >= self.batch_size:
+            self.write(type(obj), buffer)
+            buffer.clear()
+
+    def flush(self) -> None:
+        for model, buffer in self._buffers.items():
+            if buffer:
+                self.write(model, buffer)
+                buffer.clear()
+
+    def write(self, model: type[Model], objs: list[Model]) -> None:
+        if self.method == "copy":
+            self.copy(model, objs)
+        else:
+            fields = model._meta.local_concrete_fields
+            manager = model._base_manager.using(self.using)
+            # Stay under the database's limit on query parameters.
+            size = max(self.connection.ops.bulk_batch_size(fields, objs), 1)
+            for start in range(0, len(objs), size):
+                manager._insert(objs[start : start + size], fields=fields, using=self.using, raw=True)
+        label = model._meta.label_lower
+        self.counts[label] = self.counts.get(label, 0) + len(objs)
+
+    def copy(self, model: type[Model], objs: list[Model]) -> None:
+        fields = model._meta.local_concrete_fields
+        quote_name = self.connection.ops.quote_name
+        sql = "COPY {} ({}) FROM STDIN".format(
+            quote_name(model._meta.db_table),
+            ", ".join(quote_name(field.column) for field in fields),
+        )
+
+        data = io.StringIO()
+        for obj in objs:
+            data.write(
+                "\t".join(
+                    _copy_text(field.get_db_prep_save(getattr(obj, field.attname), self.connection))
+                    for field in fields
+                )
+            )
+            data.write("\n")
+        data.seek(0)
+
+        with self.connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, "copy_expert"):  # psycopg2
+                raw_cursor.copy_expert(sql, data)
+            else:  # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(data.getvalue())
@@ -0,0 +1,363 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from core.exceptions import OpenGraphFetchError
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different spellings share a cache entry.
+    Lowercases the scheme and host, drops default ports and fragments and sorts the query string.
+    Args:
+        url (str): The URL to normalize.
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with per-entry expiry.
+    Attributes:
+        max_entries (int): Number of entries kept before the least recently used one is evicted.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found nothing or an expired entry.
+        evictions (int): Number of entries dropped to make room for new ones.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[float, Any] | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class OpenGraphCache:
+    """
+    Two-tier cache for Open Graph data keyed by normalized URL.
+    The first tier is a per-process LRUCache, the second one is a Django cache shared by all workers.
+    Successful fetches and failures are stored with separate TTLs so dead URLs are not refetched on every save.
+    """
+
+    key_prefix = "og"
+
+    def __init__(
+        self, *, alias: str, max_entries: int, ttl: int, failure_ttl: int
+    ) -> None:
+        self.alias = alias
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.local = LRUCache(max_entries=max_entries)
+        self.remote_hits = 0
+        self.remote_misses = 0
+
+    @property
+    def remote(self) -> Any:
+        return caches[self.alias]
+
+    def make_key(self, url: str) -> str:
+        digest = hashlib.sha1(normalize_url(url).encode()).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def get(self, url: str) -> dict | None:
+        """
+        Look up cached Open Graph data.
+        Args:
+            url (str): The URL of the page.
+        Returns:
+            dict | None: The cached Open Graph data or None on a miss.
+        Raises:
+            OpenGraphFetchError: If a recent fetch of the URL failed.
+        """
+        key = self.make_key(url)
+        entry = self.local.get(key)
+
+        if entry is None:
+            entry = self.remote.get(key)
+            if entry is None:
+                self.remote_misses += 1
+                return None
+            self.remote_hits += 1
+            self.local.set(key, entry[1], expires_at=entry[0])
+
+        value = entry[1]
+        if "error" in value:
+            raise OpenGraphFetchError(value["error"])
+        return dict(value["data"])
+
+    def _store(self, url: str, value: dict, ttl: int) -> None:
+        key = self.make_key(url)
+        expires_at = time.time() + ttl
+        self.local.set(key, value, expires_at=expires_at)
+        self.remote.set(key, (expires_at, value), timeout=ttl)
+
+    def set(self, url: str, og_data: dict) -> None:
+        self._store(url, {"data": og_data}, self.ttl)
+
+    def set_failure(self, url: str, error: str) -> None:
+        self._store(url, {"error": error}, self.failure_ttl)
+
+    def delete(self, url: str) -> None:
+        key = self.make_key(url)
+        self.local.delete(key)
+        self.remote.delete(key)
+
+    def acquire_fill_lock(self, url: str, timeout: int) -> bool:
+        """
+        Try to become the only worker process fetching the URL.
+        Relies on the atomic add() of the Django cache, so it only spans processes
+        when the cache backend is shared (Redis, Memcached, database).
+        """
+        return self.remote.add(f"{self.make_key(url)}:lock", 1, timeout=timeout)
+
+    def release_fill_lock(self, url: str) -> None:
+        self.remote.delete(f"{self.make_key(url)}:lock")
+
+    def wait(self, url: str, timeout: float, interval: float = 0.1) -> dict | None:
+        """
+        Wait for another worker process holding the fill lock to cache the URL.
+        Args:
+            url (str): The URL of the page.
+            timeout (float): The maximum number of seconds to wait.
+            interval (float): The number of seconds between polls.
+        Returns:
+            dict | None: The Open Graph data, or None if the lock was released or timed out without a result.
+        Raises:
+            OpenGraphFetchError: If the other worker's fetch failed.
+        """
+        key = self.make_key(url)
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            entry = self.remote.get(key)
+            if entry is not None:
+                self.local.set(key, entry[1], expires_at=entry[0])
+                value = entry[1]
+                if "error" in value:
+                    raise OpenGraphFetchError(value["error"])
+                return dict(value["data"])
+            if self.remote.get(f"{key}:lock") is None:
+                return None
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "remote": {"hits": self.remote_hits, "misses": self.remote_misses},
+        }
+
+
+@lru_cache(maxsize=None)
+def get_open_graph_cache() -> OpenGraphCache:
+    """Returns the process-wide Open Graph cache configured from settings."""
+    return OpenGraphCache(
+        alias=settings.OPEN_GRAPH_CACHE_ALIAS,
+        max_entries=settings.OPEN_GRAPH_CACHE_MAX_ENTRIES,
+        ttl=settings.OPEN_GRAPH_CACHE_TTL,
+        failure_ttl=settings.OPEN_GRAPH_CACHE_FAILURE_TTL,
+    )
+
+
+class ResponseCache:
+    """
+    Read-through cache of API response data, keyed by user, endpoint and query string.
+    Every key embeds the user's version number. Writes bump the version, which orphans all of
+    the user's cached responses at once; the orphans simply expire.
+    Versions start from the current time, so a version key lost to eviction or a cache restart
+    never comes back to a number that older entries were stored under.
+    """
+
+    key_prefix = "response"
+
+    def __init__(self, *, alias: str, ttl: int) -> None:
+        self.alias = alias
+        self.ttl = ttl
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> Any:
+        return caches[self.alias]
+
+    def version_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}:version:{user_id}"
+
+    def get_version(self, user_id: int) -> int:
+        key = self.version_key(user_id)
+        version = self.backend.get(key)
+        if version is None:
+            self.backend.add(key, time.time_ns(), timeout=None)
+            version = self.backend.get(key)
+        return version
+
+    def bump_version(self, user_id: int) -> None:
+        try:
+            self.backend.incr(self.version_key(user_id))
+        except ValueError:
+            self.backend.set(self.version_key(user_id), time.time_ns(), timeout=None)
+
+    def make_key(self, request: Any, endpoint: str) -> str:
+        user_id = request.user.pk
+        digest = hashlib.sha1(
+            f"{request.get_full_path()}|{request.accepted_renderer.format}".encode()
+        ).hexdigest()
+        return f"{self.key_prefix}:{user_id}:{self.get_version(user_id)}:{endpoint}:{digest}"
+
+    def _count(self, counter: dict[str, int], endpoint: str) -> None:
+        with self._lock:
+            counter[endpoint] = counter.get(endpoint, 0) + 1
+
+    def get(self, key: str, endpoint: str) -> dict | None:
+        entry = self.backend.get(key)
+        self._count(self.misses if entry is None else self.hits, endpoint)
+        return entry
+
+    def set(self, key: str, entry: dict) -> None:
+        self.backend.set(key, entry, timeout=self.ttl)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {
+                    "hits": self.hits.get(endpoint, 0),
+                    "misses": self.misses.get(endpoint, 0),
+                    "hit_ratio": self.hits.get(endpoint, 0)
+                    / (self.hits.get(endpoint, 0) + self.misses.get(endpoint, 0)),
+                }
+                for endpoint in sorted(self.hits.keys() | self.misses.keys())
+            }
+
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide response cache configured from settings."""
+    return ResponseCache(alias=settings.RESPONSE_CACHE_ALIAS, ttl=settings.RESPONSE_CACHE_TTL)
+
+
+# Backends that keep entries in each worker process; a version bumped in one worker is not
+# seen by the others, which would keep serving the old responses until they expire.
+PER_PROCESS_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def check_response_cache(app_configs: Any = None, **kwargs) -> list[checks.CheckMessage]:
+    """System check: the response cache may only be enabled on a backend shared by all workers."""
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return []
+    backend = settings.CACHES.get(settings.RESPONSE_CACHE_ALIAS, {}).get("BACKEND")
+    if backend in PER_PROCESS_CACHE_BACKENDS:
+        return [
+            checks.Error(
+                f"RESPONSE_CACHE_ENABLED needs a cache shared by all worker processes, but "
+                f"RESPONSE_CACHE_ALIAS {settings.RESPONSE_CACHE_ALIAS!r} uses {backend}.",
+                hint="Point RESPONSE_CACHE_ALIAS at a Redis, Memcached, database or file cache.",
+                id="core.E001",
+            )
+        ]
+    return []
+
+
+def invalidate_user_responses(user_id: int) -> None:
+    """
+    Drop every cached response of the user once the current transaction commits.
+    Bumping before the commit would let a concurrent read cache the old rows under the new version.
+    """
+    transaction.on_commit(lambda: get_response_cache().bump_version(user_id))
+
+
+def cache_user_response(view_method: Callable) -> Callable:
+    """
+    Decorator for the GET handler of an APIView that caches successful responses per user
+    (see ResponseCache). Responses carry an X-Cache header saying whether they were cached.
+    Goes inside list_condition or object_condition, which add ETag and Last-Modified to hits
+    and misses alike.
+    """
+
+    @wraps(view_method)
+    def wrapper(view: Any, request: Any, *args, **kwargs) -> Any:
+        if not settings.RESPONSE_CACHE_ENABLED or not request.user.is_authenticated:
+            return view_method(view, request, *args, **kwargs)
+
+        cache = get_response_cache()
+        endpoint = type(view).__name__
+        key = cache.make_key(request, endpoint)
+        entry = cache.get(key, endpoint)
+        if entry is not None:
+            response = Response(entry["data"], status=entry["status"])
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = view_method(view, request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, {"data": response.data, "status": response.status_code})
+        response["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
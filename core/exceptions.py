@@ -33,4 +33,34 @@ class LinkExistsError(APIException):
 class UserExistsError(APIException):
     status_code = 400
     default_detail = "User already exists"
-    default_code = "bad_request"
\ No newline at end of file
+    default_code = "bad_request"
+
+
+class OpenGraphFetchError(APIException):
+    status_code = 400
+    default_detail = "Could not fetch link metadata"
+    default_code = "bad_request"
+
+
+class HostUnavailableError(OpenGraphFetchError):
+    status_code = 503
+    default_detail = "The link's host is temporarily unavailable, try again later"
+    default_code = "host_unavailable"
+
+
+class InvalidImportFileError(APIException):
+    status_code = 400
+    default_detail = "Import file must be a JSON list of URLs or a Netscape bookmarks file"
+    default_code = "bad_request"
+
+
+class InvalidCursorError(APIException):
+    status_code = 400
+    default_detail = "Invalid cursor"
+    default_code = "bad_request"
+
+
+class PreconditionFailedError(APIException):
+    status_code = 412
+    default_detail = "The resource was modified since it was read"
+    default_code = "precondition_failed"
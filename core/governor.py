@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+from core.exceptions import HostUnavailableError
+
+
+def is_host_failure(exc: BaseException) -> bool:
+    """Returns True for errors that say the host is unhealthy (timeouts, connection errors, 5xx)."""
+    if isinstance(exc, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return False
+
+
+class HostState:
+    """Concurrency slots, latency history and circuit breaker state of a single host."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, max_in_flight: int) -> None:
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.in_flight = 0
+        self.latency: float | None = None
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+
+
+class FetchGovernor:
+    """
+    Limits and protects outbound fetches per host.
+    Every host gets at most max_in_flight concurrent requests, a read timeout adapted to its
+    recent latency, and a circuit breaker that opens after failure_threshold consecutive failures.
+    While the breaker is open, fetches fail immediately with HostUnavailableError; after
+    reset_timeout seconds a single probe request is let through to decide whether to close it.
+    """
+
+    latency_smoothing = 0.2
+    latency_multiplier = 4
+    max_hosts = 10_000
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int,
+        acquire_timeout: float,
+        failure_threshold: int,
+        reset_timeout: float,
+        min_read_timeout: float,
+        max_read_timeout: float,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.acquire_timeout = acquire_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.min_read_timeout = min_read_timeout
+        self.max_read_timeout = max_read_timeout
+        self._hosts: OrderedDict[str, HostState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_host(self, host: str) -> HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = HostState(self.max_in_flight)
+                self._prune()
+            self._hosts.move_to_end(host)
+            return state
+
+    def _prune(self) -> None:
+        for host in list(self._hosts):
+            if len(self._hosts) <= self.max_hosts:
+                break
+            state = self._hosts[host]
+            if state.in_flight == 0 and state.state == HostState.CLOSED:
+                del self._hosts[host]
+
+    def read_timeout(self, state: HostState) -> float:
+        if state.latency is None:
+            return self.max_read_timeout
+        timeout = state.latency * self.latency_multiplier
+        return min(max(timeout, self.min_read_timeout), self.max_read_timeout)
+
+    def _before_request(self, host: str, state: HostState) -> None:
+        with self._lock:
+            if state.state == HostState.CLOSED:
+                return
+            if state.state == HostState.OPEN:
+                if time.monotonic() - state.opened_at < self.reset_timeout:
+                    raise HostUnavailableError(f"Circuit breaker is open for {host}")
+                state.state = HostState.HALF_OPEN
+                return
+            # Half-open: a probe request is already running.
+            raise HostUnavailableError(f"Circuit breaker is open for {host}")
+
+    def _record_success(self, state: HostState, elapsed: float) -> None:
+        with self._lock:
+            if state.latency is None:
+                state.latency = elapsed
+            else:
+                state.latency += self.latency_smoothing * (elapsed - state.latency)
+            state.failures = 0
+            state.state = HostState.CLOSED
+
+    def _record_failure(self, state: HostState) -> None:
+        with self._lock:
+            state.failures += 1
+            if state.state == HostState.HALF_OPEN or state.failures >= self.failure_threshold:
+                state.state = HostState.OPEN
+                state.opened_at = time.monotonic()
+
+    def _record_neutral(self, state: HostState) -> None:
+        with self._lock:
+            if state.state == HostState.HALF_OPEN:
+                state.state = HostState.CLOSED
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[float]:
+        """
+        Reserve a concurrency slot for fetching the URL.
+        Yields:
+            float: The read timeout to use for the request.
+        Raises:
+            HostUnavailableError: If the breaker is open or no slot frees up within acquire_timeout.
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        state = self._get_host(host)
+        self._before_request(host, state)
+
+        if not state.slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                if state.state == HostState.HALF_OPEN:
+                    state.state = HostState.OPEN
+            raise HostUnavailableError(f"Too many concurrent requests to {host}")
+
+        with self._lock:
+            state.in_flight += 1
+        started = time.monotonic()
+        try:
+            yield self.read_timeout(state)
+        except BaseException as e:
+            if is_host_failure(e):
+                self._record_failure(state)
+            else:
+                self._record_neutral(state)
+            raise
+        else:
+            self._record_success(state, time.monotonic() - started)
+        finally:
+            with self._lock:
+                state.in_flight -= 1
+            state.slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                host: {
+                    "in_flight": state.in_flight,
+                    "latency": state.latency,
+                    "read_timeout": self.read_timeout(state),
+                    "failures": state.failures,
+                    "state": state.state,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+@lru_cache(maxsize=None)
+def get_fetch_governor() -> FetchGovernor:
+    """Returns the process-wide fetch governor configured from settings."""
+    return FetchGovernor(
+        max_in_flight=settings.OPEN_GRAPH_HOST_MAX_IN_FLIGHT,
+        acquire_timeout=settings.OPEN_GRAPH_HOST_ACQUIRE_TIMEOUT,
+        failure_threshold=settings.OPEN_GRAPH_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.OPEN_GRAPH_BREAKER_RESET_TIMEOUT,
+        min_read_timeout=settings.OPEN_GRAPH_MIN_READ_TIMEOUT,
+        max_read_timeout=settings.OPEN_GRAPH_READ_TIMEOUT,
+    )
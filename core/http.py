@@ -0,0 +1,78 @@
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class HttpClient:
+    """
+    Shared outbound HTTP client with per-host keep-alive connection pools.
+    Attributes:
+        session (requests.Session): The session holding the connection pools.
+        timeout (tuple[float, float]): The default (connect, read) timeouts in seconds.
+    Methods:
+        get(url: str, **kwargs) -> requests.Response:
+            Sends a GET request, reusing a pooled connection to the host when one is idle.
+        pool_stats() -> list[dict]:
+            Returns the state of every per-host connection pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int,
+        pool_maxsize: int,
+        connect_timeout: float,
+        read_timeout: float,
+        user_agent: str,
+    ) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.session.headers["User-Agent"] = user_agent
+        # The session is shared by every user, so never carry cookies between requests.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def get(self, url: str, *, timeout: Any = None, **kwargs) -> requests.Response:
+        return self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+
+    def pool_stats(self) -> list[dict]:
+        pools = self.adapter.poolmanager.pools
+        stats = []
+
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.append(
+                {
+                    "scheme": pool.scheme,
+                    "host": pool.host,
+                    "port": pool.port,
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle_connections": pool.pool.qsize() if pool.pool else 0,
+                    "max_connections": pool.pool.maxsize if pool.pool else 0,
+                }
+            )
+        return stats
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> HttpClient:
+    """Returns the process-wide outbound HTTP client configured from settings."""
+    return HttpClient(
+        pool_connections=settings.OPEN_GRAPH_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.OPEN_GRAPH_HTTP_POOL_MAXSIZE,
+        connect_timeout=settings.OPEN_GRAPH_CONNECT_TIMEOUT,
+        read_timeout=settings.OPEN_GRAPH_READ_TIMEOUT,
+        user_agent=settings.OPEN_GRAPH_USER_AGENT,
+    )
@@ -0,0 +1,75 @@
+import json
+from typing import Any, Iterator, TextIO
+
+WHITESPACE = " \t\n\r"
+# Characters that can continue a number, e.g. "2" followed by ".5e3" in the next chunk.
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the items of a top-level JSON array one by one, reading the file in chunks.
+    Memory is bounded by the largest item instead of the size of the file.
+    Args:
+        f (TextIO): The file, opened in text mode.
+        chunk_size (int): The number of characters read at a time.
+    Yields:
+        Any: The decoded items.
+    Raises:
+        ValueError: If the file is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if eof or not fill():
+                raise ValueError("Unexpected end of JSON array")
+            continue
+
+        char = buffer[position]
+        if not started:
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            position += 1
+            continue
+        if char == "]":
+            return
+        if char == ",":
+            position += 1
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The item continues in the next chunk (or the file is broken, which shows at EOF).
+            if eof or not fill():
+                raise
+            continue
+        number = isinstance(item, (int, float)) and not isinstance(item, bool)
+        if (
+            not eof
+            and (end == len(buffer) or (number and buffer[end] in NUMBER_CHARS))
+            and fill()
+        ):
+            # A number that stops at the end of the buffer, or right before a character that
+            # continues it ("2" of "2.5"), may have more in the next chunk.
+            continue
+        position = end
+        yield item
@@ -0,0 +1,52 @@
+HTML_MIME_TYPES = ("text/html", "application/xhtml+xml")
+
+# Content types that say nothing about the body, so the first bytes are sniffed instead.
+GENERIC_MIME_TYPES = ("", "application/octet-stream", "binary/octet-stream", "text/plain")
+
+SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+    (b"fLaC", "audio/flac"),
+    (b"\x1a\x45\xdf\xa3", "video/webm"),
+)
+MP3_FRAME_HEADERS = (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2")
+RIFF_FORMATS = {b"WEBP": "image/webp", b"WAVE": "audio/wav", b"AVI ": "video/x-msvideo"}
+EPUB_MARKER = b"mimetypeapplication/epub+zip"
+
+
+def get_mime_type(content_type: str | None) -> str:
+    """Returns the lowercased MIME type of a Content-Type header, without parameters."""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def is_html(mime_type: str) -> bool:
+    return mime_type in HTML_MIME_TYPES
+
+
+def sniff_mime_type(prefix: bytes) -> str | None:
+    """
+    Guess the MIME type of a binary document from its first bytes.
+    Args:
+        prefix (bytes): The first bytes of the body (a few hundred are enough).
+    Returns:
+        str | None: The MIME type of a known binary format, or None if the body may be HTML.
+    """
+    for signature, mime_type in SIGNATURES:
+        if prefix.startswith(signature):
+            return mime_type
+
+    if prefix[:2] in MP3_FRAME_HEADERS:
+        return "audio/mpeg"
+    if prefix.startswith(b"RIFF") and prefix[8:12] in RIFF_FORMATS:
+        return RIFF_FORMATS[prefix[8:12]]
+    if prefix[4:8] == b"ftyp":
+        brand = prefix[8:12]
+        return "audio/mp4" if brand.startswith(b"M4A") else "video/mp4"
+    if prefix.startswith(b"PK\x03\x04"):
+        return "application/epub+zip" if EPUB_MARKER in prefix[:64] else "application/zip"
+    return None
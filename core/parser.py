@@ -0,0 +1,202 @@
+import codecs
+import json
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+CHARSET_SNIFF_BYTES = 2048
+
+ICON_RELS = ("icon", "shortcut icon", "apple-touch-icon")
+
+
+class MetadataExtractor(HTMLParser):
+    """
+    Event-driven extractor that collects page metadata in a single scan of the document.
+    Understands OpenGraph and Twitter Card <meta> tags, JSON-LD scripts, <link rel="canonical">,
+    icon links, <title> and <meta name="description">. Only the first value of every key is kept.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.open_graph: dict[str, str] = {}
+        self.twitter: dict[str, str] = {}
+        self.meta: dict[str, str] = {}
+        self.links: dict[str, str] = {}
+        self.json_ld: list[dict] = []
+        self.title: str | None = None
+        self._capture: str | None = None
+        self._buffer: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+        elif tag == "link":
+            self._handle_link(dict(attrs))
+        elif tag == "title" and self.title is None:
+            self._start_capture("title")
+        elif tag == "script":
+            script_type = (dict(attrs).get("type") or "").lower()
+            if script_type == "application/ld+json":
+                self._start_capture("json_ld")
+
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._capture == "title" and tag == "title":
+            self.title = " ".join("".join(self._buffer).split()) or None
+            self._capture = None
+        elif self._capture == "json_ld" and tag == "script":
+            self._add_json_ld("".join(self._buffer))
+            self._capture = None
+
+    def close(self) -> None:
+        super().close()
+        # Keep the title of documents cut off by the download byte cap.
+        if self._capture == "title":
+            self.handle_endtag("title")
+
+    def _start_capture(self, name: str) -> None:
+        self._capture = name
+        self._buffer = []
+
+    def _handle_meta(self, attrs: dict) -> None:
+        key = (attrs.get("property") or attrs.get("name") or "").strip().lower()
+        content = attrs.get("content")
+        if not key or content is None:
+            return
+
+        content = content.strip()
+        if key.startswith("og:"):
+            self.open_graph.setdefault(key[3:], content)
+        elif key.startswith("twitter:"):
+            self.twitter.setdefault(key[8:], content)
+        else:
+            self.meta.setdefault(key, content)
+
+    def _handle_link(self, attrs: dict) -> None:
+        rel = " ".join((attrs.get("rel") or "").lower().split())
+        href = attrs.get("href")
+        if rel and href:
+            self.links.setdefault(rel, href.strip())
+
+    def _add_json_ld(self, text: str) -> None:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            graph = item.get("@graph")
+            if isinstance(graph, list):
+                self.json_ld.extend(node for node in graph if isinstance(node, dict))
+            else:
+                self.json_ld.append(item)
+
+    def json_ld_value(self, *keys: str) -> str | None:
+        """Returns the first string value found under any of the keys in the JSON-LD nodes."""
+        for node in self.json_ld:
+            for key in keys:
+                value = _json_ld_text(node.get(key))
+                if value:
+                    return value
+        return None
+
+    def metadata(self, base_url: str | None = None) -> dict:
+        """
+        Returns the collected metadata, preferring OpenGraph, then Twitter Cards, then JSON-LD,
+        then plain HTML tags. Relative URLs are resolved against base_url.
+        """
+        image = (
+            self.open_graph.get("image")
+            or self.open_graph.get("image:url")
+            or self.open_graph.get("image:secure_url")
+            or self.twitter.get("image")
+            or self.twitter.get("image:src")
+            or self.json_ld_value("image", "thumbnailUrl")
+        )
+        icon = next((self.links[rel] for rel in ICON_RELS if rel in self.links), None)
+        canonical_url = self.links.get("canonical") or self.open_graph.get("url")
+
+        return {
+            "title": (
+                self.open_graph.get("title")
+                or self.twitter.get("title")
+                or self.json_ld_value("headline", "name")
+                or self.title
+            ),
+            "description": (
+                self.open_graph.get("description")
+                or self.twitter.get("description")
+                or self.json_ld_value("description")
+                or self.meta.get("description")
+            ),
+            "image": _absolute_url(base_url, image),
+            "type": self.open_graph.get("type") or self.json_ld_value("@type"),
+            "site_name": self.open_graph.get("site_name") or self.twitter.get("site"),
+            "canonical_url": _absolute_url(base_url, canonical_url),
+            "icon": _absolute_url(base_url, icon),
+        }
+
+
+def _json_ld_text(value: object) -> str | None:
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, list):
+        return next((text for text in map(_json_ld_text, value) if text), None)
+    if isinstance(value, dict):
+        return _json_ld_text(value.get("url") or value.get("name"))
+    return None
+
+
+def _absolute_url(base_url: str | None, url: str | None) -> str | None:
+    if not url:
+        return None
+    return urljoin(base_url, url) if base_url else url
+
+
+def detect_encoding(content: bytes, declared: str | None = None) -> str:
+    """
+    Returns the encoding of an HTML document: the declared one, a <meta charset>, or UTF-8.
+    Args:
+        content (bytes): The beginning of the document.
+        declared (str | None): The charset from the Content-Type header, if any.
+    Returns:
+        str: A codec name known to Python.
+    """
+    candidates = [declared]
+    match = META_CHARSET_RE.search(content[:CHARSET_SNIFF_BYTES])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def parse_metadata(content: bytes, encoding: str | None = None, base_url: str | None = None) -> dict:
+    """
+    Extract page metadata from raw HTML in a single pass.
+    Args:
+        content (bytes): The HTML document (or its <head> section).
+        encoding (str | None): The charset declared by the server, if any.
+        base_url (str | None): The URL of the page, used to resolve relative URLs.
+    Returns:
+        dict: The metadata with the keys title, description, image, type, site_name, canonical_url and icon.
+    """
+    text = content.decode(detect_encoding(content, encoding), errors="replace")
+
+    extractor = MetadataExtractor()
+    extractor.feed(text)
+    extractor.close()
+    return extractor.metadata(base_url)
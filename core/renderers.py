@@ -0,0 +1,33 @@
+from typing import Any
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types orjson does not know (Decimal, lazy strings, timedelta, QuerySet, ...) are encoded
+# like DRF encodes them, e.g. Decimal as a number.
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, producing the same compact output as DRF's JSONRenderer
+    with its default settings (UTC datetimes end in "Z", Decimal is a number, U+2028 and
+    U+2029 are escaped) several times faster. Unlike JSONRenderer it writes NaN and infinite
+    floats as null instead of failing. Falls back to JSONRenderer when the client asks for
+    indented output.
+    """
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        if data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+        # Valid JSON but not valid JavaScript; escaped like JSONRenderer does.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
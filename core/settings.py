@@ -51,6 +51,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 REST_FRAMEWORK = {
@@ -117,6 +118,16 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -157,3 +168,90 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Build list responses from .values() projections instead of model instances and
+# ModelSerializer; see core.utils.get_paginated_response.
+FAST_LIST_RESPONSES = False
+
+# Above this many rows (by the planner's estimate) paginated responses over unfiltered
+# querysets report the estimate instead of running COUNT(*); filtered ones always count.
+# None always counts exactly.
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10_000
+
+
+# Per-user cache of read endpoint responses (see core.cache.ResponseCache). Writes invalidate
+# it by bumping a version stored in the cache, so every worker process must see the same
+# backend: RESPONSE_CACHE_ALIAS has to point at a shared one (Redis, Memcached, database or
+# file). A system check refuses to enable it on the per-process local memory backend.
+RESPONSE_CACHE_ENABLED = False
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TTL = 60 * 5
+
+
+# Background jobs
+
+BACKGROUND_WORKERS = 4
+
+# Save links right away and fetch Open Graph data on the background pool.
+# When disabled, link creation blocks until the page has been fetched.
+LINK_ENRICHMENT_ASYNC = True
+
+# Bulk link import
+LINK_BULK_IMPORT_MAX_LINKS = 5000
+LINK_BULK_IMPORT_WORKERS = 8
+LINK_BULK_IMPORT_BATCH_SIZE = 500
+# Uploaded import files are read into memory; larger files are rejected with 400.
+LINK_BULK_IMPORT_MAX_FILE_SIZE = 5 * 1024 * 1024
+
+# Link export: links read per database round trip while streaming an export
+LINK_EXPORT_CHUNK_SIZE = 2000
+
+# Link search: the text search configuration of titles and descriptions
+LINK_SEARCH_CONFIG = "english"
+
+
+# Open Graph cache
+
+OPEN_GRAPH_CACHE_ALIAS = "default"
+OPEN_GRAPH_CACHE_MAX_ENTRIES = 1024
+OPEN_GRAPH_CACHE_TTL = 60 * 60 * 24
+OPEN_GRAPH_CACHE_FAILURE_TTL = 60 * 5
+
+
+# Open Graph fetching
+
+# Pages are streamed and reading stops at </head> or after this many bytes.
+OPEN_GRAPH_MAX_BYTES = 512 * 1024
+OPEN_GRAPH_CHUNK_SIZE = 16 * 1024
+
+# Outbound connections are kept alive in per-host pools shared by all threads.
+# POOL_CONNECTIONS is the number of hosts kept, POOL_MAXSIZE the connections kept per host.
+OPEN_GRAPH_HTTP_POOL_CONNECTIONS = 32
+OPEN_GRAPH_HTTP_POOL_MAXSIZE = 8
+OPEN_GRAPH_CONNECT_TIMEOUT = 3.05
+OPEN_GRAPH_READ_TIMEOUT = 10
+OPEN_GRAPH_USER_AGENT = "OpenGraphBot/1.0 (+https://github.com/Victorious-hub/Open_Graph)"
+
+# Concurrent fetches of the same URL wait for the one already in flight.
+# The lock TTL must outlast a fetch (connect + read timeout).
+OPEN_GRAPH_FETCH_LOCK_TTL = 30
+OPEN_GRAPH_FETCH_WAIT = 20
+
+# Per-host limits. Read timeouts adapt to each host's latency between MIN_READ_TIMEOUT
+# and OPEN_GRAPH_READ_TIMEOUT. After FAILURE_THRESHOLD consecutive failures a host's
+# circuit breaker opens and fetches fail fast for RESET_TIMEOUT seconds.
+OPEN_GRAPH_HOST_MAX_IN_FLIGHT = 4
+OPEN_GRAPH_HOST_ACQUIRE_TIMEOUT = 2
+OPEN_GRAPH_MIN_READ_TIMEOUT = 2
+OPEN_GRAPH_BREAKER_FAILURE_THRESHOLD = 5
+OPEN_GRAPH_BREAKER_RESET_TIMEOUT = 60
+# Background enrichment retries a link whose host is unavailable this many times in total,
+# one breaker reset apart, before marking it failed.
+OPEN_GRAPH_ENRICH_MAX_ATTEMPTS = 5
+
+# HTML is parsed on a pool of this many processes so parsing does not hold the GIL
+# of the web workers. 0 parses on the calling thread.
+OPEN_GRAPH_PARSER_WORKERS = 0
+OPEN_GRAPH_PARSER_START_METHOD = "spawn"
+OPEN_GRAPH_PARSER_TIMEOUT = 10
@@ -0,0 +1,49 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key within the process.
+    The first caller (the leader) runs the function; callers arriving while it is in flight
+    wait for the leader and receive the same result or exception.
+    Attributes:
+        wait_timeout (float | None): How long followers wait before running the function themselves.
+    """
+
+    def __init__(self, wait_timeout: float | None = None) -> None:
+        self.wait_timeout = wait_timeout
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            try:
+                return future.result(timeout=self.wait_timeout)
+            except FutureTimeoutError:
+                return func(*args, **kwargs)
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -1,14 +1,49 @@
-from typing import Any, OrderedDict
+import base64
+import hashlib
+import json
+import multiprocessing
+import posixpath
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from itertools import chain
+from typing import Any, Callable, Iterable, OrderedDict
+from urllib.parse import unquote, urlsplit
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 import requests
 
-from bs4 import BeautifulSoup
-
 from apps.links.models import Link
+from core.cache import get_open_graph_cache
+from core.exceptions import (
+    HostUnavailableError,
+    InvalidCursorError,
+    NotFoundError,
+    OpenGraphFetchError,
+    PreconditionFailedError,
+)
+from core.governor import get_fetch_governor
+from core.http import get_http_client
+from core.mime import GENERIC_MIME_TYPES, get_mime_type, is_html, sniff_mime_type
+from core.parser import parse_metadata
+from core.single_flight import SingleFlight
 from rest_framework import serializers
+from rest_framework.pagination import BasePagination
 from rest_framework.pagination import LimitOffsetPagination as _LimitOffsetPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 def create_serializer_class(name: str, fields: dict) -> serializers.Serializer:
@@ -37,12 +72,167 @@ def get_object(model_or_queryset: Any, **kwargs) -> Any:
         return None
 
 
+def make_etag(updated_at: datetime) -> str:
+    """Returns the ETag of a single object, derived from its updated_at."""
+    return f'"{updated_at.isoformat()}"'
+
+
+def get_if_match(request: Any) -> datetime | None:
+    """
+    Returns the updated_at the client expects from its If-Match header (see make_etag).
+    Returns:
+        datetime | None: None when the header is missing or "*".
+    Raises:
+        PreconditionFailedError: If the header is not an ETag issued by make_etag.
+    """
+    header = request.headers.get("If-Match", "").strip()
+    if not header or header == "*":
+        return None
+    if header.startswith("W/"):
+        header = header[2:]
+    updated_at = parse_datetime(header.strip('"'))
+    if updated_at is None:
+        raise PreconditionFailedError
+    return updated_at
+
+
+def _memoize_on_request(func: Callable) -> Callable:
+    """Runs func once per request; condition() asks for Last-Modified and the ETag separately."""
+
+    def wrapper(request: Any, **kwargs) -> Any:
+        if not hasattr(request, "condition_state"):
+            request.condition_state = func(request, **kwargs)
+        return request.condition_state
+
+    return wrapper
+
+
+def object_condition(get_updated_at: Callable) -> Callable:
+    """
+    Decorator for the GET handler of an APIView showing a single object. Emits an ETag
+    (see make_etag) and Last-Modified from the object's updated_at and answers conditional
+    requests with 304 without running the handler.
+    Args:
+        get_updated_at (Callable): Called with the view's request and URL kwargs; returns the
+            object's updated_at, or None if it does not exist (the handler then raises 404).
+    """
+    get_updated_at = _memoize_on_request(get_updated_at)
+
+    def etag(request: Any, *args, **kwargs) -> str | None:
+        updated_at = get_updated_at(request, **kwargs)
+        return make_etag(updated_at) if updated_at is not None else None
+
+    def last_modified(request: Any, *args, **kwargs) -> datetime | None:
+        return get_updated_at(request, **kwargs)
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))
+
+
+def list_condition(get_state: Callable) -> Callable:
+    """
+    Decorator for the GET handler of an APIView listing objects. Derives a strong ETag from the
+    request path, the renderer, the newest updated_at and the row count, emits Last-Modified,
+    and answers conditional requests with 304 without serializing anything.
+    Deletions only change the row count, so If-None-Match is exact while a bare
+    If-Modified-Since may miss a deletion unless get_state accounts for it.
+    Args:
+        get_state (Callable): Called with the view's request and URL kwargs; returns the newest
+            updated_at (None when there are no rows) and the row count, optionally followed by
+            more values that change with the rows, e.g. the newest ID of rows without timestamps.
+    """
+    get_state = _memoize_on_request(get_state)
+
+    def etag(request: Any, *args, **kwargs) -> str:
+        updated_at, *values = get_state(request, **kwargs)
+        state = "|".join(
+            (
+                request.get_full_path(),
+                request.accepted_renderer.format,
+                updated_at.isoformat() if updated_at is not None else "",
+                *("" if value is None else str(value) for value in values),
+            )
+        )
+        return hashlib.sha1(state.encode()).hexdigest()
+
+    def last_modified(request: Any, *args, **kwargs) -> datetime | None:
+        return get_state(request, **kwargs)[0]
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))
+
+
+def update_object(
+    queryset: Any, *, fields: dict, expected_updated_at: datetime | None = None, attempts: int = 3
+) -> tuple[Any, dict]:
+    """
+    Update a single row, writing only the columns whose value changes, plus updated_at.
+    The UPDATE is conditioned on the updated_at that was read, so it never takes more than the
+    row's own lock and a concurrent edit is detected instead of silently overwritten.
+    Args:
+        queryset (Any): A queryset matching the row, e.g. scoped to its owner.
+        fields (dict): The new values by field name.
+        expected_updated_at (datetime | None): The updated_at the client last saw (If-Match).
+            When given, any concurrent change fails the update.
+        attempts (int): How often to retry after losing a race when no updated_at is expected.
+    Returns:
+        tuple[Any, dict]: The updated object and the previous values of the changed fields.
+    Raises:
+        NotFoundError: If no row matches.
+        PreconditionFailedError: If the row's updated_at differs from expected_updated_at,
+            or the row kept changing for every attempt.
+    """
+    for _ in range(attempts):
+        obj = queryset.only("id", "updated_at", *fields).first()
+        if obj is None:
+            raise NotFoundError
+        if expected_updated_at is not None and obj.updated_at != expected_updated_at:
+            raise PreconditionFailedError
+
+        changes = {name: value for name, value in fields.items() if getattr(obj, name) != value}
+        if not changes:
+            return obj, {}
+        previous = {name: getattr(obj, name) for name in changes}
+        changes["updated_at"] = timezone.now()
+
+        if queryset.filter(id=obj.id, updated_at=obj.updated_at).update(**changes):
+            for name, value in changes.items():
+                setattr(obj, name, value)
+            return obj, previous
+        if expected_updated_at is not None:
+            raise PreconditionFailedError
+    raise PreconditionFailedError
+
+
+def estimate_count(queryset: Any) -> int | None:
+    """
+    Returns the PostgreSQL planner's estimate of the number of rows of a queryset.
+    The estimate comes from table statistics, so it costs no scan but may be off.
+    Returns None on other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 class LimitOffsetPagination(_LimitOffsetPagination):
     """
     Custom pagination class that extends `_LimitOffsetPagination`.
+    The count of a page comes from get_counter when a subclass provides one, from the planner
+    estimate when the queryset is unfiltered and the estimate exceeds
+    PAGINATION_COUNT_ESTIMATE_THRESHOLD, and from COUNT(*) otherwise. Estimates of filtered
+    querysets, e.g. one user's rows, come from table-wide statistics and may be far off.
+    Clients that do not need it can pass ``count=false`` to skip it; ``count`` is then null.
     Attributes:
         default_limit (int): The default number of items to be displayed per page.
         max_limit (int): The maximum number of items that can be displayed per page.
+        count_query_param (str): The query parameter that turns the count off.
     Methods:
         get_paginated_data(data: dict) -> OrderedDict:
             Returns an ordered dictionary containing pagination information and the paginated data.
@@ -52,6 +242,51 @@ class LimitOffsetPagination(_LimitOffsetPagination):
 
     default_limit = 10
     max_limit = 50
+    count_query_param = "count"
+
+    def get_counter(self, queryset: Any) -> int | None:
+        """Returns a maintained count of the queryset's rows, or None if there is none."""
+        return None
+
+    def get_count(self, queryset: Any) -> int:
+        count = self.get_counter(queryset)
+        if count is not None:
+            return count
+
+        threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+        if threshold is not None and not queryset.query.where:
+            count = estimate_count(queryset)
+            if count is not None and count >= threshold:
+                return count
+        return super().get_count(queryset)
+
+    def paginate_queryset(self, queryset: Any, request: Any, view: Any = None) -> list | None:
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        if request.query_params.get(self.count_query_param, "").lower() in ("false", "0"):
+            self.count = None
+        else:
+            self.count = self.get_count(queryset)
+            if self.count > self.limit and self.template is not None:
+                self.display_page_controls = True
+
+        # The next link is decided by fetching one extra row, not by the count, which may be
+        # an estimate or missing.
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[: self.limit]
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
 
     def get_paginated_data(self, data: dict) -> OrderedDict:
         return OrderedDict(
@@ -80,6 +315,137 @@ class LimitOffsetPagination(_LimitOffsetPagination):
         )
 
 
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a unique ordering such as (created_at, id).
+    Each page is fetched with a WHERE clause on the last row of the previous page instead of an
+    OFFSET, so deep pages cost the same as the first one and rows never shift between pages.
+    Pass an empty ``cursor`` query parameter to get the first page.
+    Attributes:
+        default_limit (int): The default number of items to be displayed per page.
+        max_limit (int): The maximum number of items that can be displayed per page.
+        ordering (tuple[str, ...]): The ordering of the pages; the fields together must be unique.
+    """
+
+    default_limit = 10
+    max_limit = 50
+    limit_query_param = "limit"
+    cursor_query_param = "cursor"
+    ordering = ("-created_at", "-id")
+
+    def get_limit(self, request: Any) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def get_ordering_field(self, queryset: Any, name: str) -> Any:
+        """Returns the model field or the annotation's output field an ordering refers to."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    def decode_cursor(self, request: Any, queryset: Any) -> list | None:
+        """
+        Returns the position encoded in the cursor, each value converted by its ordering field.
+        Raises:
+            InvalidCursorError: If the cursor was not made by encode_cursor for this ordering.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise InvalidCursorError
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise InvalidCursorError
+
+        values = []
+        for field, value in zip(self.ordering, position):
+            try:
+                value = self.get_ordering_field(queryset, field.lstrip("-")).to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise InvalidCursorError
+            if value is None:
+                raise InvalidCursorError
+            values.append(value)
+        return values
+
+    def encode_cursor(self, item: Any) -> str:
+        position = [
+            item[field.lstrip("-")] if isinstance(item, dict) else getattr(item, field.lstrip("-"))
+            for field in self.ordering
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps(position, cls=DjangoJSONEncoder).encode()
+        ).decode()
+
+    def get_keyset_filter(self, position: list) -> Q:
+        """Rows after the position: (a, b) < (x, y) is expanded to a < x OR (a = x AND b < y)."""
+        keyset_filter = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_filter |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return keyset_filter
+
+    def paginate_queryset(self, queryset: Any, request: Any, view: Any = None) -> list:
+        self.request = request
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position))
+
+        rows = list(queryset[: self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data: dict) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("limit", self.limit),
+                    ("next", self.get_next_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+def nest_values(rows: Iterable[dict]) -> list[dict]:
+    """
+    Turns flat .values() rows into the nested shape of the serializers:
+    {"id": 1, "user__email": "a@b.c"} becomes {"id": 1, "user": {"email": "a@b.c"}}.
+    """
+    nested_rows = []
+    for row in rows:
+        nested = {}
+        for key, value in row.items():
+            relation, separator, field = key.partition("__")
+            if separator:
+                nested.setdefault(relation, {})[field] = value
+            else:
+                nested[key] = value
+        nested_rows.append(nested)
+    return nested_rows
+
+
 def get_paginated_response(
     *,
     pagination_class: Any,
@@ -87,19 +453,35 @@ def get_paginated_response(
     queryset: object,
     request: dict,
     view: str,
+    keyset_pagination_class: Any = None,
+    values: tuple[str, ...] | None = None,
 ) -> Response:
     """
     Returns a paginated response for the given queryset.
+    The queryset is paginated in SQL, so only the rows of the requested page are loaded and serialized.
     Args:
         pagination_class (Any): The pagination class to use.
         serializer_class (serializers.ModelSerializer): The serializer class to use.
         queryset (object): The queryset to paginate.
         request (dict): The request object.
         view (str): The view name.
+        keyset_pagination_class (Any): The pagination class to use instead when the request
+            has a ``cursor`` query parameter.
+        values (tuple[str, ...] | None): When given and FAST_LIST_RESPONSES is enabled, rows are
+            fetched with .values(*values) and returned as plain dicts (see nest_values) instead of
+            going through serializer_class. The fields must produce the serializer's output.
     Returns:
         Response: The paginated response.
     """
+    if keyset_pagination_class is not None and "cursor" in request.query_params:
+        pagination_class = keyset_pagination_class
+
     paginator = pagination_class()
+
+    if values is not None and settings.FAST_LIST_RESPONSES:
+        page = paginator.paginate_queryset(queryset.values(*values), request, view=view)
+        return paginator.get_paginated_response(nest_values(page))
+
     page = paginator.paginate_queryset(queryset, request, view=view)
 
     if page is not None:
@@ -125,9 +507,238 @@ def get_op_type(og_type: str) -> str:
     return Link.LinkType.WEBSITE.value
 
 
+single_flight = SingleFlight(wait_timeout=settings.OPEN_GRAPH_FETCH_WAIT)
+
+
 def fetch_open_graph_data(url: str) -> dict:
     """
-    Fetches Open Graph data from a given URL.
+    Fetches Open Graph data from a given URL, going through the shared Open Graph cache.
+    Concurrent fetches of the same URL are coalesced: within the process through single_flight,
+    across worker processes through a lock in the Django cache.
+    Args:
+        url (str): The URL to fetch Open Graph data from.
+    Returns:
+        dict: A dictionary containing the fetched Open Graph data (see download_open_graph_data).
+    Raises:
+        OpenGraphFetchError: If there is an error fetching data from the URL, or it failed recently.
+    """
+    og_cache = get_open_graph_cache()
+
+    og_data = og_cache.get(url)
+    if og_data is not None:
+        return og_data
+
+    return single_flight.do(og_cache.make_key(url), _fetch_and_cache_open_graph_data, url)
+
+
+def _fetch_and_cache_open_graph_data(url: str) -> dict:
+    og_cache = get_open_graph_cache()
+
+    acquired = og_cache.acquire_fill_lock(url, timeout=settings.OPEN_GRAPH_FETCH_LOCK_TTL)
+    if not acquired:
+        og_data = og_cache.wait(url, timeout=settings.OPEN_GRAPH_FETCH_WAIT)
+        if og_data is not None:
+            return og_data
+
+    try:
+        og_data = download_open_graph_data(url)
+    except HostUnavailableError:
+        # Not the URL's fault, so not remembered as a failure.
+        raise
+    except OpenGraphFetchError as e:
+        og_cache.set_failure(url, str(e.detail))
+        raise
+    else:
+        og_cache.set(url, og_data)
+        return og_data
+    finally:
+        # Released only after the result is cached, so waiting processes find it.
+        if acquired:
+            og_cache.release_fill_lock(url)
+
+
+def build_og_data(metadata: dict) -> dict:
+    """
+    Maps extracted page metadata onto the Link fields.
+    Args:
+        metadata (dict): The metadata returned by core.parser.parse_metadata.
+    Returns:
+        dict: A dictionary with the keys 'title', 'description', 'image' and 'link_type',
+            plus the supplementary 'site_name', 'canonical_url' and 'icon'.
+    """
+    title_length = Link._meta.get_field("title").max_length
+    image_length = Link._meta.get_field("image").max_length
+
+    title = metadata["title"]
+    image = metadata["image"]
+    return {
+        "title": title[:title_length] if title else None,
+        "description": metadata["description"],
+        "image": image if image and len(image) <= image_length else None,
+        "link_type": (
+            get_op_type(metadata["type"].lower())
+            if metadata["type"]
+            else Link.LinkType.WEBSITE.value
+        ),
+        "site_name": metadata["site_name"],
+        "canonical_url": metadata["canonical_url"],
+        "icon": metadata["icon"],
+    }
+
+
+_parser_pool: ProcessPoolExecutor | None = None
+_parser_pool_lock = threading.Lock()
+
+
+def get_parser_pool() -> ProcessPoolExecutor | None:
+    """
+    Returns the process pool used to parse HTML, or None when OPEN_GRAPH_PARSER_WORKERS is 0
+    and pages are parsed on the calling thread.
+    Workers are started with OPEN_GRAPH_PARSER_START_METHOD; they only import core.parser,
+    which does not depend on Django.
+    """
+    global _parser_pool
+
+    if settings.OPEN_GRAPH_PARSER_WORKERS <= 0:
+        return None
+    if _parser_pool is None:
+        with _parser_pool_lock:
+            if _parser_pool is None:
+                _parser_pool = ProcessPoolExecutor(
+                    max_workers=settings.OPEN_GRAPH_PARSER_WORKERS,
+                    mp_context=multiprocessing.get_context(
+                        settings.OPEN_GRAPH_PARSER_START_METHOD
+                    ),
+                )
+    return _parser_pool
+
+
+def _reset_parser_pool(pool: ProcessPoolExecutor) -> None:
+    global _parser_pool
+
+    with _parser_pool_lock:
+        if _parser_pool is pool:
+            _parser_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_page(content: bytes, encoding: str | None, base_url: str) -> dict:
+    """
+    Parses a downloaded page into Open Graph data, on the parser pool when one is configured.
+    Args:
+        content (bytes): The HTML document (or its <head> section).
+        encoding (str | None): The charset declared by the server, if any.
+        base_url (str): The URL of the page.
+    Returns:
+        dict: The Open Graph data (see build_og_data).
+    Raises:
+        OpenGraphFetchError: If parsing takes longer than OPEN_GRAPH_PARSER_TIMEOUT.
+    """
+    pool = get_parser_pool()
+    if pool is None:
+        return build_og_data(parse_metadata(content, encoding, base_url))
+
+    try:
+        future = pool.submit(parse_metadata, content, encoding, base_url)
+        metadata = future.result(timeout=settings.OPEN_GRAPH_PARSER_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()
+        raise OpenGraphFetchError(f"Parsing {base_url} timed out")
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OOM killer): start a fresh pool next time.
+        _reset_parser_pool(pool)
+        metadata = parse_metadata(content, encoding, base_url)
+    return build_og_data(metadata)
+
+
+HEAD_END_RE = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+HEAD_END_MAX_LENGTH = 7
+
+
+def read_page_head(chunks: Iterable[bytes], *, max_bytes: int) -> bytes:
+    """
+    Reads a streamed response until the end of the <head> section or until max_bytes have been read.
+    Args:
+        chunks (Iterable[bytes]): The body chunks, e.g. from iter_content() of a response opened with stream=True.
+        max_bytes (int): The maximum number of bytes to keep.
+    Returns:
+        bytes: The beginning of the document, up to and including </head> when it was found.
+    """
+    buffer = bytearray()
+
+    for chunk in chunks:
+        search_from = max(0, len(buffer) - HEAD_END_MAX_LENGTH)
+        buffer.extend(chunk)
+
+        match = HEAD_END_RE.search(buffer, search_from)
+        if match:
+            return bytes(buffer[: match.end()])
+        if len(buffer) >= max_bytes:
+            return bytes(buffer[:max_bytes])
+
+    return bytes(buffer)
+
+
+MIME_LINK_TYPES = {
+    "application/pdf": Link.LinkType.BOOK.value,
+    "application/epub+zip": Link.LinkType.BOOK.value,
+    "application/x-mobipocket-ebook": Link.LinkType.BOOK.value,
+}
+
+
+def get_link_type_from_mime(mime_type: str) -> str:
+    """
+    Returns the link type of a non-HTML document based on its MIME type.
+    Parameters:
+        mime_type (str): The MIME type, e.g. "video/mp4".
+    Returns:
+        str: The link type.
+    """
+    if mime_type.startswith("video/"):
+        return Link.LinkType.VIDEO.value
+    if mime_type.startswith("audio/"):
+        return Link.LinkType.MUSIC.value
+    return MIME_LINK_TYPES.get(mime_type, Link.LinkType.WEBSITE.value)
+
+
+def build_file_og_data(url: str, mime_type: str) -> dict:
+    """
+    Builds Open Graph data for a non-HTML document (PDF, video, audio, image...) without downloading it.
+    The title is the file name; images are their own preview.
+    """
+    title_length = Link._meta.get_field("title").max_length
+    image_length = Link._meta.get_field("image").max_length
+
+    title = unquote(posixpath.basename(urlsplit(url).path))
+    is_image = mime_type.startswith("image/") and len(url) <= image_length
+    return {
+        "title": title[:title_length] or None,
+        "description": None,
+        "image": url if is_image else None,
+        "link_type": get_link_type_from_mime(mime_type),
+        "site_name": None,
+        "canonical_url": None,
+        "icon": None,
+    }
+
+
+def get_declared_encoding(response: requests.Response) -> str | None:
+    """
+    Returns the charset from the Content-Type header, or None to let the parser detect it.
+    requests falls back to ISO-8859-1 for text/* responses, which breaks pages that declare
+    their charset in a <meta> tag, so only an explicit charset is trusted.
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if "charset=" not in content_type.lower():
+        return None
+    return response.encoding
+
+
+def download_open_graph_data(url: str) -> dict:
+    """
+    Downloads a page and extracts its Open Graph data, bypassing the cache.
+    Only the <head> section is downloaded, capped at OPEN_GRAPH_MAX_BYTES.
+    Non-HTML documents are classified from their MIME type and their body is not downloaded.
     Args:
         url (str): The URL to fetch Open Graph data from.
     Returns:
@@ -137,46 +748,40 @@ def fetch_open_graph_data(url: str) -> dict:
             - 'image': The URL of the image associated with the webpage.
             - 'link_type': The type of the webpage link.
     Raises:
-        Exception: If there is an error fetching data from the URL.
+        HostUnavailableError: If the host's circuit breaker is open or it has too many requests in flight.
+        OpenGraphFetchError: If there is an error fetching data from the URL.
     """
+    http_client = get_http_client()
+
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Error fetching data from {url}: {e}")
+        with get_fetch_governor().slot(url) as read_timeout:
+            with http_client.get(
+                url, stream=True, timeout=(http_client.timeout[0], read_timeout)
+            ) as response:
+                response.raise_for_status()
+                final_url = response.url
+                chunks = response.iter_content(chunk_size=settings.OPEN_GRAPH_CHUNK_SIZE)
+
+                # Non-HTML bodies are never downloaded: the headers, or the first
+                # chunk when they are too generic, are enough to classify them.
+                mime_type = get_mime_type(response.headers.get("Content-Type"))
+                if is_html(mime_type):
+                    file_mime_type = None
+                elif mime_type not in GENERIC_MIME_TYPES:
+                    file_mime_type = mime_type
+                else:
+                    first_chunk = next(chunks, b"")
+                    file_mime_type = sniff_mime_type(first_chunk)
+                    chunks = chain([first_chunk], chunks)
+
+                if file_mime_type is None:
+                    content = read_page_head(chunks, max_bytes=settings.OPEN_GRAPH_MAX_BYTES)
+                    encoding = get_declared_encoding(response)
     except requests.exceptions.Timeout:
-        Exception("Request time out")
-    else:
-        og_data = {
-            "title": None,
-            "description": None,
-            "image": None,
-            "link_type": Link.LinkType.WEBSITE.value,
-        }
-
-        og_title = soup.find("meta", property="og:title")
-        og_description = soup.find("meta", property="og:description")
-        og_image = soup.find("meta", property="og:image")
-        og_type = soup.find("meta", property="og:type")
-
-        if og_title:
-            og_data["title"] = og_title["content"]
-        if og_description:
-            og_data["description"] = og_description["content"]
-        if og_image:
-            og_data["image"] = og_image["content"]
-        if og_type:
-            og_data["link_type"] = get_op_type(og_type["content"])
-
-        if not og_data["title"]:
-            title_tag = soup.find("title")
-            if title_tag:
-                og_data["title"] = title_tag.text
-
-        if not og_data["description"]:
-            meta_description = soup.find("meta", attrs={"name": "description"})
-            if meta_description:
-                og_data["description"] = meta_description["content"]
+        raise OpenGraphFetchError(f"Request to {url} timed out")
+    except requests.exceptions.RequestException as e:
+        raise OpenGraphFetchError(f"Error fetching data from {url}: {e}")
 
-        return og_data
+    if file_mime_type is not None:
+        return build_file_og_data(final_url, file_mime_type)
+    return parse_page(content, encoding, final_url)
@@ -1,11 +1,29 @@
 import json
+import os
+import shutil
+import sys
+import tempfile
+
+from core.jsonstream import iter_json_array
 
-def prettify_json(input_file, output_file):
-    with open(input_file, 'r') as f:
-        data = json.load(f)
 
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=4)
+def prettify_json(input_file, output_file):
+    # Items are streamed one at a time, so large dumps never sit in memory. The output goes
+    # to a temporary file first because input and output may be the same file.
+    directory = os.path.dirname(os.path.abspath(output_file))
+    with open(input_file, 'r') as src, tempfile.NamedTemporaryFile(
+        'w', dir=directory, delete=False, suffix='.json'
+    ) as dst:
+        dst.write('[')
+        for index, item in enumerate(iter_json_array(src)):
+            dst.write(',\n    ' if index else '\n    ')
+            dst.write(json.dumps(item, indent=4).replace('\n', '\n    '))
+        dst.write('\n]' if dst.tell() > 1 else ']')
+    if os.path.exists(output_file):
+        shutil.copymode(output_file, dst.name)
+    os.replace(dst.name, output_file)
 
-# Prettify the data.json file
-prettify_json('data.json', 'data.json')
\ No newline at end of file
+# Prettify the data.json file, or the file given on the command line
+if __name__ == '__main__':
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'data.json'
+    prettify_json(input_file, sys.argv[2] if len(sys.argv) > 2 else input_file)